@@ -0,0 +1,79 @@
+"""Append-only binary action log.
+
+Every state-changing step of a ``Game`` is appended as one entry::
+
+    op (1 byte) | seat (1 byte) | ms since previous entry (varint) | payload length (varint) | payload
+
+Seats are join-order numbers (``Game.seats``), so an entry is a handful of
+bytes. ``replay.py`` rebuilds a game from its seed and this log; the time
+deltas let a replay follow the original pacing.
+"""
+import time
+
+OP_JOIN, OP_START, OP_ACT, OP_BOT, OP_HUMAN, OP_LEAVE = range(6)
+OP_NAMES = ("join", "start", "act", "bot", "human", "leave")
+
+def write_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+def read_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+def write_str(buf, s):
+    raw = s.encode()
+    write_varint(buf, len(raw))
+    buf.extend(raw)
+
+def read_str(data, pos):
+    n, pos = read_varint(data, pos)
+    return bytes(data[pos:pos + n]).decode(), pos + n
+
+class ActionLog:
+    __slots__ = ("data", "_last")
+
+    def __init__(self, data=b""):
+        self.data = bytearray(data)
+        self._last = None
+
+    def append(self, op, seat, payload=b""):
+        now = time.monotonic()
+        elapsed = 0 if self._last is None else int((now - self._last) * 1000)
+        self._last = now
+        self.data.append(op)
+        self.data.append(seat)
+        write_varint(self.data, elapsed)
+        write_varint(self.data, len(payload))
+        self.data.extend(payload)
+
+    def __iter__(self):
+        """Yield ``(op, seat, elapsed_ms, payload)`` for every entry."""
+        data, pos, end = self.data, 0, len(self.data)
+        while pos < end:
+            op, seat = data[pos], data[pos + 1]
+            elapsed, pos = read_varint(data, pos + 2)
+            n, pos = read_varint(data, pos)
+            yield op, seat, elapsed, bytes(data[pos:pos + n])
+            pos += n
+
+    def __len__(self):
+        return len(self.data)
+
+    def __bytes__(self):
+        return bytes(self.data)
+
+    def __getstate__(self):
+        return (bytes(self.data),)
+
+    def __setstate__(self, state):
+        self.data = bytearray(state[0])
+        self._last = None
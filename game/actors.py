@@ -0,0 +1,109 @@
+"""Per-room serialized command queues (actor model).
+
+Every mutation of a room goes through ``RoomCommandQueues.submit``: the
+callable is queued on that room's queue and run by the room's single worker
+task, so commands for one room never interleave while different rooms run
+in parallel. Queues and events come from the Socket.IO server, so this works
+with eventlet green threads as well as real threads.
+
+Commands must not ``submit`` to their own room (the worker would wait on
+itself); nested calls for the same room run inline instead.
+"""
+import contextvars
+import time
+
+# 현재 태스크(스레드/그린렛)가 실행 중인 방 – 같은 방으로의 중첩 submit 감지용
+_current_room = contextvars.ContextVar("current_room", default=None)
+
+class RoomActor:
+    def __init__(self, room_id, queue):
+        self.room_id = room_id
+        self.queue = queue
+        self.processed = 0
+        self.wait_total = 0.0     # seconds commands spent queued
+        self.wait_max = 0.0
+        self.busy_total = 0.0     # seconds spent running commands
+
+    def stats(self):
+        return {
+            "depth": self.queue.qsize(),
+            "processed": self.processed,
+            "wait_avg_ms": round(self.wait_total / self.processed * 1e3, 3) if self.processed else 0.0,
+            "wait_max_ms": round(self.wait_max * 1e3, 3),
+            "busy_ms": round(self.busy_total * 1e3, 3),
+        }
+
+_STOP = object()
+
+class RoomCommandQueues:
+    def __init__(self, socketio):
+        self.socketio = socketio
+        self.actors: dict[str, RoomActor] = {}
+
+    @property
+    def _eio(self):
+        return self.socketio.server.eio
+
+    def _actor(self, room_id):
+        actor = self.actors.get(room_id)
+        if actor is None:
+            actor = RoomActor(room_id, self._eio.create_queue())
+            self.actors[room_id] = actor
+            self.socketio.start_background_task(self._run, actor)
+        return actor
+
+    def submit(self, room_id, fn):
+        """Run ``fn()`` on ``room_id``'s worker and return its result."""
+        if _current_room.get() == room_id:
+            return fn()
+        actor = self._actor(room_id)
+        done = self._eio.create_event()
+        box = {}
+        actor.queue.put((time.perf_counter(), fn, box, done))
+        done.wait()
+        if "error" in box:
+            raise box["error"]
+        return box.get("result")
+
+    def post(self, room_id, fn):
+        """Queue ``fn()`` on ``room_id``'s worker without waiting for it."""
+        if _current_room.get() == room_id:
+            fn()
+            return
+        self._actor(room_id).queue.put((time.perf_counter(), fn, None, None))
+
+    def close(self, room_id):
+        """Stop the room's worker once its queued commands have run."""
+        actor = self.actors.pop(room_id, None)
+        if actor:
+            actor.queue.put(_STOP)
+
+    def _run(self, actor):
+        _current_room.set(actor.room_id)
+        while True:
+            item = actor.queue.get()
+            if item is _STOP:
+                return
+            queued_at, fn, box, done = item
+            started = time.perf_counter()
+            wait = started - queued_at
+            actor.wait_total += wait
+            actor.wait_max = max(actor.wait_max, wait)
+            try:
+                result = fn()
+                if box is not None:
+                    box["result"] = result
+            except Exception as exc:
+                if box is None:        # post(): 기다리는 쪽이 없으므로 기록만
+                    self.socketio.server.logger.exception("room %s command failed", actor.room_id)
+                else:                  # re-raised in the submitting request
+                    box["error"] = exc
+            finally:
+                actor.processed += 1
+                actor.busy_total += time.perf_counter() - started
+                if done is not None:
+                    done.set()
+
+    def stats(self):
+        """Queue depth and wait time per room."""
+        return {room_id: actor.stats() for room_id, actor in list(self.actors.items())}
@@ -1,10 +1,19 @@
+import os
 from flask import Flask
 from flask_socketio import SocketIO
+from shard import ShardConfig, client_manager
 
 def create_app():
     app = Flask(__name__)
     app.secret_key = 'super-secret-key'
-    socketio = SocketIO(app, cors_allowed_origins="*")
+    # 설정 시 방 상태를 SQLite 에 저장하고 재시작 시 복구
+    app.config['STORE_PATH'] = os.getenv('TRUMPOUT_DB')
+    # 멀티 프로세스 배포: 방 id 샤드 소유권 + 워커 간 메시지 큐
+    app.config['SHARD'] = ShardConfig.from_env()
+    # 이 시간(초) 안의 상태 변경은 수신자당 한 번의 emit 으로 병합 (0 = 즉시 전송)
+    app.config['BROADCAST_TICK'] = float(os.getenv('BROADCAST_TICK', 0.02))
+    socketio = SocketIO(app, cors_allowed_origins="*",
+                        client_manager=client_manager(os.getenv('MESSAGE_QUEUE')))
 
     from models import card_to_html
     app.jinja_env.globals.update(card_to_html=card_to_html)
@@ -18,7 +27,6 @@ def create_app():
 
 
 if __name__ == "__main__":
-    import os
     app, socketio = create_app()
     port = int(os.getenv("PORT", 5000))
     socketio.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
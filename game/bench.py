@@ -0,0 +1,552 @@
+"""Micro-benchmarks for the game server hot paths.
+
+Usage: ``python bench.py [name ...]`` (run from the ``game`` directory).
+Without arguments every benchmark is run.
+"""
+import json
+import os
+import sys
+import time
+
+import random
+
+from models import CARDS, Game, GameConfig, Player
+from state import public_state, private_state
+
+BENCHMARKS = {}
+
+def benchmark(fn):
+    BENCHMARKS[fn.__name__] = fn
+    return fn
+
+def timeit(fn, repeat=200):
+    """Return mean seconds per call of ``fn``."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+def make_game(player_count, rounds=3, **cfg):
+    """Build a game with ``player_count`` players and some played rounds."""
+    cfg = GameConfig(player_count=player_count, **cfg)
+    game = Game(cfg, room_id="bench")
+    for i in range(player_count):
+        game.add_player(Player(f"p{i}"))
+    game.first_player_index = 0
+    for _ in range(rounds):
+        cur_round = game.start_round()
+        player = cur_round.players[cur_round.current_turn_index]
+        # 가장 큰 숫자 카드 한 장으로 배팅 후 나머지는 폴드
+        numeric = [i for i, c in enumerate(player.hand) if not c.is_special()]
+        if numeric:
+            cur_round.player_raise(player, [numeric[0]])
+        for p in cur_round.players:
+            if p is not player:
+                cur_round.player_fold(p)
+        cur_round.check_round_over()
+        game.end_round()
+    game.start_round()
+    return game
+
+# ── broadcast ───────────────────────────────────────
+
+@benchmark
+def broadcast():
+    """Per-broadcast payload build: per-player public state vs shared."""
+    print(f"{'players':>8} {'per-player (ms)':>16} {'shared (ms)':>12}")
+    for n in (2, 4, 8, 16, 32, 64):
+        game = make_game(n, hand_count=6, first_player_threshold=100)
+
+        def per_player():
+            for p in game.players:
+                dict(public_state(game), **private_state(game, p))
+
+        def shared():
+            public = public_state(game)
+            for p in game.players:
+                dict(public, **private_state(game, p))
+
+        print(f"{n:>8} {timeit(per_player, 50) * 1e3:>16.3f} {timeit(shared, 50) * 1e3:>12.3f}")
+
+@benchmark
+def wire():
+    """Card wire format: full-state JSON bytes and build + encode time, html vs ids."""
+    import json
+
+    print(f"{'players':>8} {'html (B)':>9} {'ids (B)':>8} {'html (ms)':>10} {'ids (ms)':>9}")
+    for n in (2, 4, 8):
+        game = make_game(n, rounds=6, hand_count=8, first_player_threshold=100)
+        for _ in range(n):   # 배팅 기록이 쌓이도록 몇 번 더 레이즈
+            cur_round = game.current_round
+            player = cur_round.players[cur_round.current_turn_index]
+            numeric = [i for i, c in enumerate(player.hand) if not c.is_special()]
+            if numeric:
+                cur_round.player_raise(player, [numeric[-1]])
+
+        def encode(wire):
+            public = public_state(game, wire)
+            return [json.dumps(dict(public, **private_state(game, p, wire)), ensure_ascii=False).encode()
+                    for p in game.players]
+
+        sizes = {w: sum(map(len, encode(w))) // n for w in ("html", "ids")}
+        times = {w: timeit(lambda: encode(w), 200) * 1e3 for w in ("html", "ids")}
+        print(f"{n:>8} {sizes['html']:>9} {sizes['ids']:>8} {times['html']:>10.3f} {times['ids']:>9.3f}")
+
+# ── deck ────────────────────────────────────────────
+
+def legacy_refresh(game):
+    """The previous Deck.refresh_deck: rebuild counts and scan the whole game."""
+    full = {}
+    for card in CARDS:
+        full[(card.suit, card.rank)] = full.get((card.suit, card.rank), 0) + 1
+    in_play = {}
+    def add_card(card):
+        key = (card.suit, card.rank)
+        in_play[key] = in_play.get(key, 0) + 1
+    for p in game.players:
+        for card in p.hand:
+            add_card(card)
+        for card in p.score_cards:
+            add_card(card)
+    if game.current_round is not None:
+        for entry in game.current_round.bet_history:
+            for card in entry[1]:
+                add_card(card)
+    remaining = []
+    for key, count in full.items():
+        for _ in range(count - in_play.get(key, 0)):
+            remaining.append(key)
+    random.shuffle(remaining)
+    return remaining
+
+@benchmark
+def deck():
+    """draw / refresh_deck: legacy whole-game scan vs discard-pile shuffle."""
+    print(f"{'rounds':>8} {'legacy refresh (us)':>20} {'refresh (us)':>13} {'draw (us)':>10}")
+    for rounds in (5, 50, 200):
+        game = make_game(8, rounds=rounds, first_player_threshold=1000)
+        deck_ = game.deck
+        saved = (deck_.cards, deck_.discards)
+
+        def refresh():
+            deck_.cards, deck_.discards = saved[0][:], saved[1][:]
+            deck_.refresh_deck(game)
+
+        def draw():
+            deck_.cards, deck_.discards = saved[0][:], saved[1][:]
+            deck_.draw(len(deck_.cards) + len(deck_.discards))
+
+        print(f"{rounds:>8} {timeit(lambda: legacy_refresh(game), 2000) * 1e6:>20.1f}"
+              f" {timeit(refresh, 2000) * 1e6:>13.1f} {timeit(draw, 2000) * 1e6:>10.1f}")
+        deck_.cards, deck_.discards = saved
+
+# ── store ───────────────────────────────────────────
+
+@benchmark
+def snapshot():
+    """Game snapshot size and SQLite save / load latency as games grow."""
+    import os
+    import tempfile
+    from store import SQLiteStore, decode_game, encode_game
+
+    print(f"{'rounds':>8} {'bytes':>7} {'encode (us)':>12} {'decode (us)':>12}"
+          f" {'save 100 (ms)':>14} {'load 100 (ms)':>14}")
+    for rounds in (0, 10, 50, 200):
+        game = make_game(4, rounds=rounds, first_player_threshold=1000)
+        data = encode_game(game)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.db")
+            _, games = SQLiteStore.open_pair(path, batch_size=1000)
+
+            def save():
+                for i in range(100):
+                    games[f"room{i}"] = game
+                games.flush()
+
+            save_s = timeit(save, 5)
+            games.conn.close()
+            load_s = timeit(lambda: SQLiteStore.open_pair(path)[1].conn.close(), 5)
+        print(f"{rounds:>8} {len(data):>7} {timeit(lambda: encode_game(game), 500) * 1e6:>12.1f}"
+              f" {timeit(lambda: decode_game(data), 500) * 1e6:>12.1f}"
+              f" {save_s * 1e3:>14.2f} {load_s * 1e3:>14.2f}")
+
+@benchmark
+def replay():
+    """Seed + action log: log size and full-game replay time vs. a snapshot."""
+    from replay import replay as replay_game
+    from simulate import greedy_policy, random_policy, step
+    from store import encode_game
+
+    rng = random.Random(0)
+    print(f"{'players':>8} {'entries':>8} {'log (B)':>8} {'snapshot (B)':>13} {'replay (ms)':>12} {'us/entry':>9}")
+    for n in (2, 4, 8):
+        game = Game(GameConfig(player_count=n, first_player_threshold=3), "bench", seed=n)
+        for i in range(n):
+            game.add_player(Player(f"p{i}"))
+        for _ in range(5000):    # 진행이 막힌 게임 대비 상한
+            if game.game_over:
+                break
+            if game.current_round is None:
+                game.start_round()
+                continue
+            cur_round = game.current_round
+            policy = greedy_policy if rng.random() < 0.8 else random_policy
+            step(game, cur_round.players[cur_round.current_turn_index], policy, rng)
+        if not game.game_over:
+            print(f"{n:>8}  game did not finish in 5000 steps, skipped")
+            continue
+        log = bytes(game.log)
+        entries = sum(1 for _ in game.log)
+        took = timeit(lambda: replay_game(game.cfg, game.seed, log), 20)
+        print(f"{n:>8} {entries:>8} {len(log):>8} {len(encode_game(game)):>13}"
+              f" {took * 1e3:>12.2f} {took / entries * 1e6:>9.1f}")
+
+# ── shards ──────────────────────────────────────────
+
+def _shard_worker(args):
+    index, workers, rooms, actions = args
+    import os
+    os.environ["SHARD_INDEX"] = str(index)
+    os.environ["SHARD_URLS"] = ",".join(f"http://shard{i}" for i in range(workers))
+    from loadtest import run_load
+    cfg = {"title": "bench", "private": "1", "hand_count": 6, "first_player_threshold": 5}
+    report = run_load(rooms, 4, actions, cfg, seed=index * 1000)
+    return report["actions"], report["duration_s"]
+
+@benchmark
+def shards():
+    """Aggregate action throughput with the rooms split over N shard processes."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    total_rooms, actions = 8, 60
+    print(f"{'workers':>8} {'actions':>8} {'actions/s':>10}")
+    for workers in (1, 2, 4):
+        with ProcessPoolExecutor(workers) as pool:
+            jobs = [(i, workers, total_rooms // workers, actions) for i in range(workers)]
+            results = list(pool.map(_shard_worker, jobs))
+        done = sum(a for a, _ in results)
+        print(f"{workers:>8} {done:>8} {done / max(d for _, d in results):>10.1f}")
+
+# ── room list ───────────────────────────────────────
+
+@benchmark
+def room_list():
+    """Public room listing: full filter of waiting_rooms vs. one RoomIndex page."""
+    from roomindex import RoomIndex
+
+    print(f"{'rooms':>8} {'filter all (us)':>16} {'index page (us)':>16}")
+    for n in (100, 1000, 10000):
+        waiting_rooms = {
+            f"r{i}": {'config': GameConfig(title=f"room {i}", private=i % 4 == 0),
+                      'joiners': ["host"], 'bots': set()}
+            for i in range(n)
+        }
+        index = RoomIndex(waiting_rooms)
+        legacy = lambda: {rid: info for rid, info in waiting_rooms.items() if not info['config'].private}
+        print(f"{n:>8} {timeit(legacy, 50) * 1e6:>16.1f}"
+              f" {timeit(lambda: index.page(n // 2, 20), 500) * 1e6:>16.1f}")
+
+# ── metrics ─────────────────────────────────────────
+
+@benchmark
+def metrics():
+    """Instrumentation overhead: one observation, one counted state emit, one scrape."""
+    import json
+    from metrics import Registry
+
+    registry = Registry()
+    hist = registry.histogram("h", "latency", ("endpoint",))
+    counter = registry.counter("c", "count", ("event",))
+    for i in range(50):
+        hist.observe(i / 1000, f"e{i % 10}")
+    state = dict(public_state(make_game(4)), version=1)
+    print(f"{'observe (us)':>13} {'inc (us)':>9} {'state payload size (us)':>24} {'scrape (us)':>12}")
+    print(f"{timeit(lambda: hist.observe(0.003, 'e1'), 100000) * 1e6:>13.2f}"
+          f" {timeit(lambda: counter.inc('e1'), 100000) * 1e6:>9.2f}"
+          f" {timeit(lambda: len(json.dumps(state, separators=(',', ':'))), 2000) * 1e6:>24.2f}"
+          f" {timeit(registry.render, 200) * 1e6:>12.1f}")
+
+# ── session cookie ──────────────────────────────────
+
+@benchmark
+def session():
+    """Signed session cookie: size and sign + verify time, transient state in vs. out."""
+    from flask import Flask
+    from sessions import SessionStore
+
+    app = Flask(__name__)
+    app.secret_key = "bench"
+    serializer = app.session_interface.get_signing_serializer(app)
+    identity = {"player_name": "플레이어1", "room_id": "a1b2c3"}
+    cases = {
+        "cookie (old)": dict(identity, error_message="4장을 정확히 선택해야 합니다."),
+        "identity only": dict(identity, sid=SessionStore.new_id()),
+    }
+    print(f"{'session':>14} {'cookie (B)':>11} {'sign+verify (us)':>17}")
+    for label, data in cases.items():
+        cookie = serializer.dumps(data)
+        took = timeit(lambda: serializer.loads(serializer.dumps(data)), 2000)
+        print(f"{label:>14} {len(cookie):>11} {took * 1e6:>17.1f}")
+
+# ── actions ─────────────────────────────────────────
+
+@benchmark
+def actions():
+    """Per-turn server cost: POST /action + redirected index render vs socket ack."""
+    from app import create_app
+    from loadtest import action_form, action_payload
+    from simulate import greedy_policy, scripted_action
+    import routes
+
+    os.environ["BROADCAST_TICK"] = "0"     # 턴마다 바로 push (병합은 coalesce 참고)
+    app, socketio = create_app()
+    app.testing = True
+    rng = random.Random(0)
+
+    def new_room():
+        clients = [app.test_client() for _ in range(4)]
+        resp = clients[0].post('/create', data={"title": "bench", "private": "1",
+                                                "host_name": "p0", "player_count": 4})
+        room_id = resp.headers['Location'].rsplit('/', 1)[-1]
+        for i, c in enumerate(clients[1:], 1):
+            c.post(f'/join/{room_id}', data={"name": f"p{i}"})
+        clients[0].get('/')
+        sockets = [socketio.test_client(app, flask_test_client=c) for c in clients]
+        return routes.games[room_id], clients, sockets
+
+    def turn(room, via_socket):
+        game, clients, sockets = room
+        cur_round = game.current_round
+        player = cur_round.players[cur_round.current_turn_index]
+        seat = int(player.name[1:])
+        action = scripted_action(game, player, greedy_policy, rng)
+        if via_socket:
+            sockets[seat].emit('action', action_payload(action), callback=True)
+        else:
+            clients[seat].post('/action', data=action_form(action))
+            clients[seat].get('/')          # 예전 흐름: 성공 시 index 로 redirect
+        for sock in sockets:
+            sock.get_received()
+
+    print(f"{'path':>14} {'per turn (ms)':>14}")
+    for label, via_socket in (("POST+redirect", False), ("socket ack", True)):
+        room = new_room()
+        total, n = 0.0, 0
+        while n < 300:
+            if room[0].game_over:
+                room = new_room()
+            total += timeit(lambda: turn(room, via_socket), 1)
+            n += 1
+        print(f"{label:>14} {total / n * 1e3:>14.3f}")
+
+# ── stats ───────────────────────────────────────────
+
+@benchmark
+def stats():
+    """/stats summary cost stays flat as rounds accumulate."""
+    print(f"{'rounds':>7} {'summary (us)':>13} {'history scan (us)':>18}")
+    for rounds in (10, 100, 1000):
+        game = make_game(8, rounds=rounds)
+
+        def scan():
+            # 예전 방식이라면: round_history 를 훑어 플레이어별 승수 / 평균 계산
+            wins = {}
+            for h in game.round_history:
+                wins[h["winner"]] = wins.get(h["winner"], 0) + 1
+            return wins, sum(p.starting_count for p in game.players)
+        print(f"{rounds:>7} {timeit(lambda: game.stats.summary(game), 2000) * 1e6:>13.1f}"
+              f" {timeit(scan, 2000) * 1e6:>18.1f}")
+
+# ── tournament ──────────────────────────────────────
+
+@benchmark
+def tournament():
+    """Headless tournament throughput: tables/s and turn latency per worker count."""
+    from tournament import Tournament, run_headless
+
+    cfg = GameConfig(player_count=4)
+    print(f"{'workers':>8} {'tables':>7} {'tables/s':>9} {'turn p50 (us)':>14} {'turn p99 (us)':>14}")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        report = run_headless(Tournament(cfg, [f"e{i}" for i in range(256)], seed=0), workers)
+        latency = report["turn_latency_ms"]
+        print(f"{workers:>8} {report['tables']:>7} {report['tables_per_second']:>9}"
+              f" {latency['p50'] * 1e3:>14.1f} {latency['p99'] * 1e3:>14.1f}")
+
+# ── reconnect ───────────────────────────────────────
+
+@benchmark
+def reconnect():
+    """Cost of one reconnect: already current vs one merged patch for the missed versions vs full snapshot."""
+    from app import create_app
+    from loadtest import action_form, action_payload
+    from simulate import greedy_policy, scripted_action
+    import routes
+
+    os.environ["BROADCAST_TICK"] = "0"
+    app, socketio = create_app()
+    app.testing = True
+    app.extensions["resync"].rate = float("inf")      # 여기서는 admission 대기 없이 비용만 잰다
+    rng = random.Random(0)
+    clients = [app.test_client() for _ in range(4)]
+    resp = clients[0].post('/create', data={"title": "bench", "private": "1", "host_name": "p0",
+                                            "player_count": 4, "first_player_threshold": 10})
+    room_id = resp.headers['Location'].rsplit('/', 1)[-1]
+    for i, c in enumerate(clients[1:], 1):
+        c.post(f'/join/{room_id}', data={"name": f"p{i}"})
+    clients[0].get('/')
+    game = routes.games[room_id]
+    sockets = [socketio.test_client(app, flask_test_client=c) for c in clients]
+
+    def play(turns):
+        for _ in range(turns):
+            cur_round = game.current_round
+            player = cur_round.players[cur_round.current_turn_index]
+            seat = int(player.name[1:])
+            action = scripted_action(game, player, greedy_policy, rng)
+            if seat == 3:           # 연결이 끊긴 자리는 HTTP 로 행동
+                clients[3].post('/action', data=action_form(action))
+            else:
+                sockets[seat].emit('action', action_payload(action), callback=True)
+        for sock in sockets[:3]:
+            sock.get_received()
+
+    print(f"{'resume':>9} {'missed':>7} {'connect (ms)':>13} {'bytes':>7}")
+    for label, missed in (("current", 0), ("replay", 1), ("replay", 2), ("replay", 4), ("replay", 8),
+                          ("snapshot", None)):
+        sockets[3].get_received()
+        version = game.client_views[game.get_player("p3").id]["version"]
+        sockets[3].disconnect()
+        play(missed or 0)
+        auth = {"version": version if missed is not None else None}
+        start = time.perf_counter()
+        sockets[3] = socketio.test_client(app, flask_test_client=clients[3], auth=auth)
+        took = time.perf_counter() - start
+        size = sum(len(json.dumps(msg["args"][0], separators=(",", ":"))) for msg in sockets[3].get_received()
+                   if msg["name"].startswith("game_state"))
+        print(f"{label:>9} {missed if missed is not None else '-':>7} {took * 1e3:>13.3f} {size:>7}")
+
+# ── coalesce ────────────────────────────────────────
+
+@benchmark
+def coalesce():
+    """Burst of socket actions: emits and bytes each client receives, per BROADCAST_TICK."""
+    from app import create_app
+    from loadtest import action_payload
+    from simulate import greedy_policy, scripted_action
+    import routes
+
+    def run(tick, turns=200, players=4):
+        os.environ["BROADCAST_TICK"] = str(tick)
+        app, socketio = create_app()
+        app.testing = True
+        rng = random.Random(0)
+        emits = size = done = 0
+        started = time.perf_counter()
+        while done < turns:
+            clients = [app.test_client() for _ in range(players)]
+            resp = clients[0].post('/create', data={"title": "bench", "private": "1",
+                                                    "host_name": "p0", "player_count": players})
+            room_id = resp.headers['Location'].rsplit('/', 1)[-1]
+            for i, c in enumerate(clients[1:], 1):
+                c.post(f'/join/{room_id}', data={"name": f"p{i}"})
+            clients[0].get('/')
+            sockets = [socketio.test_client(app, flask_test_client=c) for c in clients]
+            for sock in sockets:
+                sock.get_received()
+            game = routes.games[room_id]
+
+            def receive():
+                nonlocal emits, size
+                for sock in sockets:
+                    for msg in sock.get_received():
+                        if msg["name"] in ("game_state_update", "game_state_patch"):
+                            emits += 1
+                            size += len(json.dumps(msg["args"][0], separators=(",", ":")))
+                            sock.emit('state_ack', {'version': msg["args"][0].get('version', 0)})
+
+            # 상태 push 를 기다리지 않고 연속으로 행동 전송
+            while done < turns and not game.game_over and game.current_round:
+                cur_round = game.current_round
+                player = cur_round.players[cur_round.current_turn_index]
+                action = scripted_action(game, player, greedy_policy, rng)
+                sockets[int(player.name[1:])].emit('action', action_payload(action), callback=True)
+                done += 1
+                receive()
+            time.sleep(tick * 3 + 0.01)
+            receive()
+            for sock in sockets:
+                sock.disconnect()
+        return emits, size, time.perf_counter() - started
+
+    print(f"{'tick (s)':>9} {'turns':>6} {'state emits':>12} {'bytes':>9} {'wall (s)':>9}")
+    base = None
+    for tick in (0, 0.02, 0.05):
+        emits, size, took = run(tick)
+        base = base or (emits, size)
+        print(f"{tick:>9} {200:>6} {emits:>12} {size:>9} {took:>9.2f}"
+              + (f"  (-{1 - emits / base[0]:.0%} emits, -{1 - size / base[1]:.0%} bytes)" if tick else ""))
+
+# ── spectators ──────────────────────────────────────
+
+@benchmark
+def spectators():
+    """Server cost per turn as spectators are added (socket writes not included)."""
+    from app import create_app
+    from loadtest import action_payload
+    from simulate import greedy_policy, scripted_action
+    import routes
+
+    os.environ["BROADCAST_TICK"] = "0"
+    app, socketio = create_app()
+    app.testing = True
+    rng = random.Random(0)
+
+    def run(viewers, turns=200):
+        clients = [app.test_client() for _ in range(4)]
+        resp = clients[0].post('/create', data={"title": "bench", "private": "1",
+                                                "host_name": "p0", "player_count": 4})
+        room_id = resp.headers['Location'].rsplit('/', 1)[-1]
+        for i, c in enumerate(clients[1:], 1):
+            c.post(f'/join/{room_id}', data={"name": f"p{i}"})
+        clients[0].get('/')
+        sockets = [socketio.test_client(app, flask_test_client=c) for c in clients]
+        watchers = [socketio.test_client(app, auth={"watch": room_id}) for _ in range(viewers)]
+        game = routes.games[room_id]
+        # 전송 자체는 제외: 테스트 클라이언트는 수신 패킷마다 JSON 을 다시 디코딩한다
+        packets = 0
+
+        def count_packet(eio_sid, pkt):
+            nonlocal packets
+            packets += 1
+        send = socketio.server._send_eio_packet
+        socketio.server._send_eio_packet = count_packet
+        total = 0.0
+        try:
+            for _ in range(turns):
+                if game.game_over:
+                    break
+                cur_round = game.current_round
+                player = cur_round.players[cur_round.current_turn_index]
+                payload = action_payload(scripted_action(game, player, greedy_policy, rng))
+                start = time.perf_counter()
+                sockets[int(player.name[1:])].emit('action', payload, callback=True)
+                total += time.perf_counter() - start
+                for sock in sockets:
+                    sock.get_received()
+        finally:
+            socketio.server._send_eio_packet = send
+        for sock in sockets + watchers:
+            sock.disconnect()
+        n = max(1, _ + 1)
+        return total / n, packets / n
+
+    print(f"{'spectators':>10} {'per turn (ms)':>14} {'packets/turn':>13}")
+    for viewers in (0, 1, 100, 500):
+        per_turn, packets = run(viewers)
+        print(f"{viewers:>10} {per_turn * 1e3:>14.3f} {packets:>13.1f}")
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name}")
+        BENCHMARKS[name]()
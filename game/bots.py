@@ -0,0 +1,121 @@
+"""AI bot players.
+
+Raise/fold decisions use determinized Monte Carlo tree search (UCT at the
+root): every iteration re-deals the cards the bot cannot see, applies one
+candidate move and plays the round out with the scripted simulator
+policies on top of the real ``Round`` rules. Searches run in a process
+pool within a per-move CPU budget, so thinking bots never block the
+socket event loop. J targeting and mulligan discards use the simulator
+heuristics directly.
+"""
+import copy
+import math
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import engine
+from models import CARDS
+from simulate import greedy_policy, random_policy, step
+
+BOT_NAME_PREFIX = "봇"
+# UCB 탐색 상수 – 보상이 라운드 점수 차(대략 ±30) 단위라 1보다 크게 잡는다
+EXPLORATION = 10.0
+
+_pool = None
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=int(os.getenv("BOT_WORKERS", os.cpu_count() or 1)))
+    return _pool
+
+def bot_name(taken):
+    """First free bot display name (봇1, 봇2, ...)."""
+    i = 1
+    while f"{BOT_NAME_PREFIX}{i}" in taken:
+        i += 1
+    return f"{BOT_NAME_PREFIX}{i}"
+
+def needs_search(game, bot):
+    """J targeting and mulligan discards are heuristic; only raise/fold is searched."""
+    return not (game.j_pending.get(bot.id)
+                or game.mulligan_info.get(bot.id, {}).get("pending"))
+
+def play_heuristic(game, bot, rng=random):
+    """Play a J / mulligan step (or a greedy move) immediately; returns events."""
+    return step(game, bot, greedy_policy, rng)
+
+# ── determinized search ─────────────────────────────
+
+def determinize(game, bot_id, rng):
+    """Copy ``game`` and re-deal every card the bot cannot see."""
+    sim = copy.deepcopy(game)
+    me = sim.players_by_id[bot_id]
+    hidden = [p for p in sim.players if p is not me]
+    pool = [card for p in hidden for card in p.hand] + [CARDS[i] for i in sim.deck.cards]
+    rng.shuffle(pool)
+    for p in hidden:
+        n = len(p.hand)
+        p.hand, pool = pool[:n], pool[n:]
+    sim.deck.cards = array('B', (card.id for card in pool))
+    sim.rng.seed(rng.getrandbits(64))   # 이후 리프레시 셔플도 표본마다 달라지도록
+    return sim, me
+
+def rollout(sim, me, move, rng):
+    """Apply ``move`` and play the round out; reward = my gain minus best opponent gain."""
+    before = {p.id: p.total_points for p in sim.players}
+    _, events = engine.apply(sim, me, move)
+    if events[0]["type"] == "error":
+        return -math.inf
+    turns = 0
+    while sim.current_round is not None and turns < 50 * len(sim.players):
+        cur_round = sim.current_round
+        player = cur_round.players[cur_round.current_turn_index]
+        step(sim, player, greedy_policy if rng.random() < 0.8 else random_policy, rng)
+        turns += 1
+    gains = {p.id: p.total_points - before[p.id] for p in sim.players}
+    mine = gains.pop(me.id)
+    return mine - max(gains.values(), default=0)
+
+def search(game, bot_id, budget, seed=None):
+    """Pick a raise or fold for ``bot_id`` within ``budget`` CPU seconds.
+
+    Candidates are widened progressively: Fold and the greedy raise first,
+    the other raises in random order, about ``sqrt(iterations)`` of them in
+    play. A hand with hundreds of legal raises still stops at the deadline.
+    """
+    rng = random.Random(seed)
+    bot = game.players_by_id[bot_id]
+    raises = [engine.Raise(m) for m in engine.legal_raises_for(game, bot)]
+    if not raises:
+        return engine.Fold()
+    rng.shuffle(raises)
+    greedy = greedy_policy(game, bot, rng)
+    if greedy in raises:
+        raises.remove(greedy)
+        raises.insert(0, greedy)
+    moves = [engine.Fold()] + raises
+    visits = [0] * len(moves)
+    totals = [0.0] * len(moves)
+    deadline = time.process_time() + budget
+    n = 0
+    while n == 0 or time.process_time() < deadline:
+        width = min(len(moves), 2 + int(math.sqrt(n)))
+        i = next((k for k in range(width) if not visits[k]), None)
+        if i is None:
+            log_n = math.log(n)
+            i = max(range(width),
+                    key=lambda k: totals[k] / visits[k] + EXPLORATION * math.sqrt(log_n / visits[k]))
+        sim, me = determinize(game, bot_id, rng)
+        reward = rollout(sim, me, moves[i], rng)
+        visits[i] += 1
+        totals[i] += reward if reward != -math.inf else -100.0
+        n += 1
+    return moves[max(range(len(moves)), key=lambda k: visits[k])]
+
+def submit_search(game, bot, budget):
+    """Run ``search`` in the worker pool; returns a Future of the chosen action."""
+    return _executor().submit(search, game, bot.id, budget, random.getrandbits(32))
@@ -0,0 +1,282 @@
+"""Request-free rules engine.
+
+``apply(game, player, action)`` runs one player action against a ``Game``
+and returns ``(game, events)``. Nothing here touches Flask, so games can be
+driven from routes, bots, simulations and load tests alike. The game is
+updated in place (copying it per action would defeat the purpose) and is
+returned for convenience.
+
+Events are plain dicts with a ``type`` key:
+
+* ``error``       – action rejected, nothing changed (``message``)
+* ``raise``       – bet accepted (``player``, ``value``, ``effect``)
+* ``j_pending``   – raiser must now pick a J target
+* ``j_target``    – J target chosen (``target``)
+* ``j_discard``   – a card was discarded from the target's hand (``card``)
+* ``mulligan``    – mulligan cards drawn (``cards``)
+* ``fold``        – player folded (``mulligan`` True if via mulligan discard)
+* ``turn``        – turn passed to ``player``
+* ``round_over``  – round finished (``winner`` or None)
+* ``game_over``   – final round played
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+
+from actionlog import OP_ACT
+from models import CARDS, evaluate_raise
+
+@dataclass(frozen=True)
+class Raise:
+    card_indices: tuple
+
+@dataclass(frozen=True)
+class Fold:
+    pass
+
+@dataclass(frozen=True)
+class MulliganDiscard:
+    discard_indices: tuple
+
+@dataclass(frozen=True)
+class JSelect:
+    target: str
+
+@dataclass(frozen=True)
+class JDiscard:
+    discard_indices: tuple
+
+def parse_action(action_type, values):
+    """Build an action from form-like input.
+
+    ``values`` maps field names to lists of strings (``request.form.getlist``).
+    Returns ``(action, error_message)``.
+    """
+    try:
+        if action_type == "raise":
+            return Raise(tuple(int(x) for x in values("card_indices"))), None
+        if action_type == "fold":
+            return Fold(), None
+        if action_type == "mulligan_discard":
+            return MulliganDiscard(tuple(int(x) for x in values("discard_indices"))), None
+        if action_type == "j_select":
+            target = (values("target") or [None])[0]
+            return JSelect(target), None
+        if action_type == "j_discard":
+            return JDiscard(tuple(int(x) for x in values("discard_indices"))), None
+    except ValueError:
+        return None, "유효한 카드 인덱스가 아닙니다."
+    return None, "알 수 없는 행동입니다."
+
+def payload_values(payload):
+    """``values`` callable for a JSON payload (the Socket.IO ``action`` event)."""
+    def values(key):
+        value = payload.get(key)
+        if value is None:
+            return []
+        return [str(v) for v in value] if isinstance(value, (list, tuple)) else [str(value)]
+    return values
+
+# ── legal move generation ───────────────────────────
+
+@lru_cache(maxsize=8192)
+def _legal_raises(hand_ids, current_highest, reversed_, max_cards_per_play):
+    hand = [CARDS[i] for i in hand_ids]
+    moves = []
+    for size in range(1, min(len(hand), max_cards_per_play + 1) + 1):
+        for combo in combinations(range(len(hand)), size):
+            error, _, _, _ = evaluate_raise([hand[i] for i in combo], current_highest,
+                                            reversed_, max_cards_per_play)
+            if error is None:
+                moves.append(combo)
+    return tuple(moves)
+
+def legal_raises(hand, current_highest, reversed_, max_cards_per_play):
+    """All legal raises for ``hand`` as sorted tuples of hand indices.
+
+    Memoized per (hand, highest, reversed, max cards) key.
+    """
+    return _legal_raises(tuple(card.id for card in hand), current_highest,
+                         reversed_, max_cards_per_play)
+
+def playable_mask(hand, moves):
+    """Per-card flag: True if the card is part of at least one legal raise."""
+    mask = [False] * len(hand)
+    for move in moves:
+        for i in move:
+            mask[i] = True
+    return mask
+
+def legal_raises_for(game, player):
+    cur_round = game.current_round
+    return legal_raises(player.hand, cur_round.current_highest, cur_round.reversed,
+                        game.cfg.max_cards_per_play)
+
+def _error(message):
+    return [{"type": "error", "message": message}]
+
+def apply(game, player, action):
+    """Apply ``action`` by ``player`` to ``game``; return ``(game, events)``."""
+    cur_round = game.current_round
+    if player is None or cur_round is None:
+        return game, _error("진행 중인 라운드가 없습니다.")
+    current_turn = cur_round.players[cur_round.current_turn_index]
+    if player is not current_turn:
+        return game, _error("아직 당신의 차례가 아닙니다.")
+
+    handler = _HANDLERS.get(type(action))
+    if handler is None:
+        return game, _error("알 수 없는 행동입니다.")
+    # 로그 payload 는 상태를 바꾸기 전에 만든다 – 적용에 성공한 행동은 반드시 기록된다
+    try:
+        payload = encode_action(game, action)
+    except ValueError as exc:
+        return game, _error(str(exc))
+    events, turn_over = handler(game, player, action)
+    if any(e["type"] == "error" for e in events):
+        return game, events
+    game.log.append(OP_ACT, game.seat_of(player), payload)
+    if turn_over:
+        events.extend(advance_turn(game))
+    return game, events
+
+def advance_turn(game):
+    """End the round if it is over, otherwise pass the turn."""
+    cur_round = game.current_round
+    if cur_round.check_round_over():
+        winner = cur_round.winner.name if cur_round.winner else None
+        game.end_round()
+        events = [{"type": "round_over", "winner": winner}]
+        if game.game_over:
+            events.append({"type": "game_over"})
+        return events
+    nxt = cur_round.next_player()
+    return [{"type": "turn", "player": nxt.name if nxt else None}]
+
+# ── action log encoding ─────────────────────────────
+# payload: 종류 1바이트 + 카드 인덱스들 (J 선택은 대상 seat 번호)
+
+_ACTION_KINDS = (Raise, Fold, MulliganDiscard, JSelect, JDiscard)
+
+def encode_action(game, action):
+    """Log payload for ``action``; ValueError (with a user message) if it cannot be encoded."""
+    kind = _ACTION_KINDS.index(type(action))
+    if isinstance(action, JSelect):
+        target = game.get_player(action.target)
+        if target is None:
+            raise ValueError("유효한 대상을 선택해주세요.")
+        return bytes((kind, game.seat_of(target)))
+    indices = getattr(action, "card_indices", getattr(action, "discard_indices", ()))
+    if not all(0 <= i < 256 for i in indices):
+        raise ValueError("잘못된 카드 인덱스입니다.")
+    return bytes((kind, *indices))
+
+def decode_action(game, payload):
+    cls = _ACTION_KINDS[payload[0]]
+    if cls is Fold:
+        return Fold()
+    if cls is JSelect:
+        return JSelect(game.players_by_id[game.seats[payload[1]]].name)
+    return cls(tuple(payload[1:]))
+
+# ── action handlers: return (events, turn_over) ──────
+
+def _raise(game, player, action):
+    cur_round = game.current_round
+    indices = action.card_indices
+    if len(set(indices)) != len(indices) or not all(0 <= i < len(player.hand) for i in indices):
+        return _error("잘못된 카드 인덱스입니다."), False
+    success, message = cur_round.player_raise(player, list(indices))
+    if not success:
+        return _error(message), False
+    _, _, value, effect = cur_round.bet_history[-1]
+    events = [{"type": "raise", "player": player.name, "value": value, "effect": effect}]
+    if effect == "J":
+        # J 효과 대기 상태 등록 – 대상 선택/버리기가 끝나야 턴이 넘어간다
+        game.j_pending[player.id] = True
+        events.append({"type": "j_pending", "player": player.name})
+        return events, False
+    return events, True
+
+def _can_mulligan(game, player):
+    """Eligible, and the deck can deal enough cards to discard ``mulligan_count`` afterwards."""
+    if player.has_raised or player.mulligan_used:
+        return False
+    available = min(len(game.deck.cards) + len(game.deck.discards), game.cfg.mulligan_count)
+    return available > 0 and len(player.hand) + available >= game.cfg.mulligan_count
+
+def _fold(game, player, action):
+    pending = game.mulligan_info.pop(player.id, None)
+    if pending:
+        # 멀리건 도중 폴드 → 뽑은 카드를 그대로 버리고 멀리건 폴드로 끝낸다
+        drawn = set(pending['cards'])
+        game.deck.discard(pending['cards'])
+        player.hand = [card for card in player.hand if card not in drawn]
+        player.mulligan_used = True
+        game.stats.mulliganed(player)
+        game.current_round.player_fold(player)
+        return [{"type": "fold", "player": player.name, "mulligan": True}], True
+    # If eligible for mulligan (덱이 비어 멀리건을 끝낼 수 없으면 그냥 폴드)
+    if _can_mulligan(game, player):
+        new_cards = game.deck.draw(game.cfg.mulligan_count)
+        player.hand.extend(new_cards)
+        game.mulligan_info[player.id] = {'pending': True, 'cards': new_cards}
+        return [{"type": "mulligan", "player": player.name, "cards": new_cards}], False
+    # Otherwise perform fold
+    success, message = game.current_round.player_fold(player)
+    if not success:
+        return _error(message), False
+    return [{"type": "fold", "player": player.name, "mulligan": False}], True
+
+def _mulligan_discard(game, player, action):
+    indices = sorted(set(action.discard_indices), reverse=True)
+    if len(indices) != game.cfg.mulligan_count:
+        return _error(f"{game.cfg.mulligan_count}장을 정확히 선택해야 합니다."), False
+    if indices and not 0 <= indices[-1] <= indices[0] < len(player.hand):
+        return _error("잘못된 카드 인덱스입니다."), False
+    game.deck.discard([player.hand.pop(idx) for idx in indices])
+    player.mulligan_used = True
+    player.last_action = "멀리건"
+    game.stats.mulliganed(player)
+    game.mulligan_info.pop(player.id, None)   # clear
+    success, message = game.current_round.player_fold(player)
+    if not success:
+        return _error(message), False
+    return [{"type": "fold", "player": player.name, "mulligan": True}], True
+
+def _j_select(game, player, action):
+    if not game.j_pending.get(player.id):
+        return _error("J 효과를 사용할 수 없습니다."), False
+    target = game.get_player(action.target)
+    if not target or target is player:
+        return _error("유효한 대상을 선택해주세요."), False
+    game.j_target[player.id] = target.name
+    return [{"type": "j_target", "player": player.name, "target": target.name}], False
+
+def _j_discard(game, player, action):
+    target = game.get_player(game.j_target.get(player.id))
+    if not game.j_pending.get(player.id) or not target:
+        return _error("먼저 패를 확인할 플레이어를 선택하세요."), False
+    indices = sorted(set(action.discard_indices), reverse=True)
+    if target.hand and (not indices or not 0 <= indices[-1] <= indices[0] < len(target.hand)):
+        return _error("잘못된 카드 인덱스입니다."), False
+    # 대상의 패가 비어 있으면 버릴 카드 없이 J 효과 종료
+    discarded = [target.hand.pop(idx) for idx in indices] if target.hand else []
+    game.deck.discard(discarded)
+    game.j_target.pop(player.id, None)
+    game.j_pending.pop(player.id, None)
+    # broadcast info message to everyone
+    if discarded:
+        game.info_message = f"{player.name} ▶ {target.name} 의 {discarded[-1].html} 를 버렸습니다."
+    else:
+        game.info_message = f"{player.name} ▶ {target.name} 의 패가 비어 있습니다."
+    return [{"type": "j_discard", "player": player.name, "target": target.name,
+             "card": discarded[-1] if discarded else None}], True
+
+_HANDLERS = {
+    Raise: _raise,
+    Fold: _fold,
+    MulliganDiscard: _mulligan_discard,
+    JSelect: _j_select,
+    JDiscard: _j_discard,
+}
@@ -0,0 +1,190 @@
+"""Multi-room load-testing harness.
+
+Opens N rooms through ``/create`` and ``/join/<room_id>`` using the Flask and
+Flask-SocketIO test clients, drives scripted Socket.IO ``action`` events from
+one thread per room, and records action → ``game_state_update`` latency,
+throughput and memory per room. The report is written as JSON so results
+can be compared across releases.
+
+Usage (from the ``game`` directory)::
+
+    python loadtest.py --rooms 50 --players 4 --actions 200 --out report.json
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import tracemalloc
+
+import engine
+from simulate import greedy_policy, percentile, random_policy, scripted_action
+
+STATE_EVENTS = ("game_state_update", "game_state_patch")
+STATE_TIMEOUT = 1.0    # seconds to wait for the state push after an action
+
+def action_form(action):
+    """Form fields the browser would POST to /action for ``action``."""
+    if isinstance(action, engine.Raise):
+        return {"action_type": "raise", "card_indices": [str(i) for i in action.card_indices]}
+    if isinstance(action, engine.Fold):
+        return {"action_type": "fold"}
+    if isinstance(action, engine.MulliganDiscard):
+        return {"action_type": "mulligan_discard", "discard_indices": [str(i) for i in action.discard_indices]}
+    if isinstance(action, engine.JSelect):
+        return {"action_type": "j_select", "target": action.target}
+    return {"action_type": "j_discard", "discard_indices": [str(i) for i in action.discard_indices]}
+
+def action_payload(action):
+    """Payload of the Socket.IO ``action`` event for ``action``."""
+    return {key: [int(v) for v in value] if isinstance(value, list) else value
+            for key, value in action_form(action).items()}
+
+class RoomDriver:
+    """Creates one room with scripted players and plays it through HTTP + sockets."""
+
+    def __init__(self, app, socketio, games, index, players, cfg, seed):
+        self.app = app
+        self.games = games
+        self.names = [f"r{index}p{j}" for j in range(players)]
+        self.clients = [app.test_client() for _ in self.names]
+        self.rng = random.Random(seed)
+        self.latencies = []
+        self.actions = 0
+        self.emits = 0
+        self.payload_bytes = 0
+
+        host = self.clients[0]
+        resp = host.post('/create', data=dict(cfg, host_name=self.names[0], player_count=players))
+        self.room_id = resp.headers['Location'].rsplit('/', 1)[-1]
+        for client, name in zip(self.clients[1:], self.names[1:]):
+            client.post(f'/join/{self.room_id}', data={'name': name})
+        self.sockets = [socketio.test_client(app, flask_test_client=c) for c in self.clients]
+        self.game = games[self.room_id]
+
+    def _drain(self, sock):
+        """Consume received events, ack state versions; return True if a state arrived."""
+        got_state = False
+        for event in sock.get_received():
+            if event["name"] in STATE_EVENTS:
+                got_state = True
+                self.emits += 1
+                payload = event["args"][0]
+                self.payload_bytes += len(json.dumps(payload, ensure_ascii=False).encode())
+                sock.emit('state_ack', {'version': payload.get('version', 0)})
+        return got_state
+
+    def run(self, max_actions):
+        game = self.game
+        while self.actions < max_actions and not game.game_over:
+            if game.current_round is None:
+                self.clients[0].get('/')          # index 가 다음 라운드를 시작
+                for sock in self.sockets:
+                    self._drain(sock)
+                continue
+            cur_round = game.current_round
+            player = cur_round.players[cur_round.current_turn_index]
+            seat = self.names.index(player.name)
+            policy = greedy_policy if self.rng.random() < 0.8 else random_policy
+            payload = action_payload(scripted_action(game, player, policy, self.rng))
+            start = time.perf_counter()
+            self.sockets[seat].emit('action', payload, callback=True)
+            # 상태는 BROADCAST_TICK 뒤에 병합되어 도착할 수 있다
+            while not self._drain(self.sockets[seat]):
+                if time.perf_counter() - start > STATE_TIMEOUT:
+                    break
+                time.sleep(0.001)
+            else:
+                self.latencies.append(time.perf_counter() - start)
+            for sock in self.sockets:
+                self._drain(sock)
+            self.actions += 1
+
+    def close(self):
+        for sock in self.sockets:
+            sock.disconnect()
+
+def run_load(rooms, players, actions, cfg, seed=0):
+    # 라우트 모듈은 앱 생성 시 등록되므로 여기서 불러온다
+    from app import create_app
+    import routes
+
+    app, socketio = create_app()
+    app.testing = True
+    tracemalloc.start()
+    base_mem = tracemalloc.get_traced_memory()[0]
+    drivers = [RoomDriver(app, socketio, routes.games, i, players, cfg, seed + i) for i in range(rooms)]
+    setup_mem = tracemalloc.get_traced_memory()[0]
+
+    threads = [threading.Thread(target=d.run, args=(actions,)) for d in drivers]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    end_mem, peak_mem = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for d in drivers:
+        d.close()
+
+    latencies = sorted(l for d in drivers for l in d.latencies)
+    queues = app.extensions["room_commands"].stats().values()
+    total_actions = sum(d.actions for d in drivers)
+    ms = lambda v: round(v * 1e3, 3) if v is not None else None
+    return {
+        "rooms": rooms,
+        "players_per_room": players,
+        "config": cfg,
+        "actions": total_actions,
+        "duration_s": round(elapsed, 3),
+        "throughput_actions_per_s": round(total_actions / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 0.50)),
+            "p95": ms(percentile(latencies, 0.95)),
+            "p99": ms(percentile(latencies, 0.99)),
+            "max": ms(latencies[-1] if latencies else None),
+        },
+        "emits": sum(d.emits for d in drivers),
+        "payload_bytes": sum(d.payload_bytes for d in drivers),
+        "memory_per_room_kb": {
+            "after_setup": round((setup_mem - base_mem) / rooms / 1024, 1),
+            "after_run": round((end_mem - base_mem) / rooms / 1024, 1),
+            "peak": round((peak_mem - base_mem) / rooms / 1024, 1),
+        },
+        "games_finished": sum(d.game.game_over for d in drivers),
+        "command_queue": {
+            "processed": sum(q["processed"] for q in queues),
+            "wait_max_ms": max((q["wait_max_ms"] for q in queues), default=0.0),
+        },
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=20)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--actions", type=int, default=200, help="max actions per room")
+    parser.add_argument("--hand-count", type=int, default=6)
+    parser.add_argument("--first-player-threshold", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tick", type=float, help="BROADCAST_TICK in seconds (0 = no merging)")
+    parser.add_argument("--out", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if args.tick is not None:
+        os.environ["BROADCAST_TICK"] = str(args.tick)
+    cfg = {
+        "title": "loadtest",
+        "private": "1",
+        "hand_count": args.hand_count,
+        "first_player_threshold": args.first_player_threshold,
+    }
+    report = run_load(args.rooms, args.players, args.actions, cfg, args.seed)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+if __name__ == "__main__":
+    main()
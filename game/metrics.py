@@ -0,0 +1,129 @@
+"""Minimal Prometheus instrumentation (text exposition format 0.0.4).
+
+Counters and histograms are plain dicts keyed by label values, guarded by
+one lock each. An observation is a dict lookup, a bisect and two adds, so
+the instrumentation stays on under load. Gauges and counters that mirror
+existing state (room counts, queue depth, evictions) are computed from a
+callback only when ``/metrics`` is scraped.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# 초 단위 지연 시간 버킷 (1ms ~ 2.5s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BYTES_BUCKETS = (128, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536)
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _labels(names, values, extra=""):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self.values.items())
+        for label_values, value in items:
+            yield self.name, _labels(self.labels, label_values), value
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}          # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self.values.get(label_values)
+            if row is None:
+                row = self.values[label_values] = [0] * (len(self.buckets) + 2)
+            row[i] += 1
+            row[-1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def samples(self):
+        with self._lock:
+            items = [(k, list(v)) for k, v in self.values.items()]
+        for label_values, row in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), row):
+                cumulative += count
+                yield (f"{self.name}_bucket",
+                       _labels(self.labels, label_values, f'le="{_number(bound)}"'), cumulative)
+            yield f"{self.name}_sum", _labels(self.labels, label_values), row[-1]
+            yield f"{self.name}_count", _labels(self.labels, label_values), cumulative
+
+class Callback:
+    """Gauge or counter read from ``fn()`` at scrape time.
+
+    ``fn`` returns a number, or a dict mapping label-value tuples to numbers.
+    """
+
+    def __init__(self, name, help, fn, kind="gauge", labels=()):
+        self.name, self.help, self.fn, self.kind, self.labels = name, help, fn, kind, tuple(labels)
+
+    def samples(self):
+        value = self.fn()
+        if not isinstance(value, dict):
+            value = {(): value}
+        for label_values, v in value.items():
+            yield self.name, _labels(self.labels, label_values), v
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def callback(self, name, help, fn, kind="gauge", labels=()):
+        return self._add(Callback(name, help, fn, kind, labels))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for m in self.metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(f"{name}{labels} {_number(value)}" for name, labels, value in m.samples())
+        return "\n".join(lines) + "\n"
@@ -1,8 +1,11 @@
-from flask import session
 import random
+from array import array
 from dataclasses import dataclass
 import uuid
 
+from actionlog import ActionLog, OP_JOIN, OP_START, OP_BOT, OP_HUMAN, OP_LEAVE, write_str
+from stats import GameStats
+
 @dataclass
 class GameConfig:
     title: str                    = "Trump OUT Room"
@@ -12,127 +15,227 @@ class GameConfig:
     mulligan_count: int           = 4
     max_cards_per_play: int       = 2
     first_player_threshold: int   = 5
+    bot_fill: bool                = False   # 게임 중 나간 자리를 봇으로 채움
 
-def card_to_html(card):
-    """Card 객체를 기호와 색상으로 표시하는 HTML 문자열 반환"""
-    symbol_map = {
-        "Hearts": "♥", "Diamonds": "♦",
-        "Clubs": "♣", "Spades": "♠",
-        "Black": "🃏", "Color": "🃏"
-    }
-    symbol = symbol_map.get(card.suit, "")
-    if card.rank.lower() == "joker":
-        if card.suit == "Black":
-            color = "black"
-        elif card.suit == "Color":
-            color = "orange"
+# 방 생성 시 허용하는 설정 범위 (rooms.html 입력 칸의 min/max 와 같다).
+# 합법 배팅 조합 수가 hand_count / max_cards_per_play 에 따라 조합적으로 늘어나므로 서버에서도 막는다.
+CONFIG_LIMITS = {
+    "player_count": (2, 8),
+    "hand_count": (3, 10),
+    "mulligan_count": (1, 6),
+    "max_cards_per_play": (1, 5),
+    "first_player_threshold": (1, 10),
+}
+
+def check_config(cfg):
+    """Raise ValueError if a field of ``cfg`` is outside ``CONFIG_LIMITS``."""
+    for field, (low, high) in CONFIG_LIMITS.items():
+        if not low <= getattr(cfg, field) <= high:
+            raise ValueError(f"{field} 값은 {low} 이상 {high} 이하여야 합니다.")
+    return cfg
+
+SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+SPECIAL_RANKS = ("j", "q", "k", "joker")
+SUIT_SYMBOLS = {
+    "Hearts": "♥", "Diamonds": "♦",
+    "Clubs": "♣", "Spades": "♠",
+    "Black": "🃏", "Color": "🃏"
+}
+CARD_TOOLTIPS = {
+    "j": "플레이어를 선택해 패를 보고 한 장 버리기",
+    "q": "레이즈 방향 역전",
+    "k": "함께 내는 숫자에 +5 (역방향일 때 -5)",
+    "joker": "마지막 플레이어 레이즈 값 카피 (점수 계산 X)",
+}
+
+def _card_face(suit, rank):
+    """카드 표시 정보: 라벨, 색상, 특수 카드 툴팁 (HTML 과 클라이언트 카드 테이블 공용)"""
+    symbol = SUIT_SYMBOLS.get(suit, "")
+    if rank == "joker":
+        color = "black" if suit == "Black" else "orange"
     else:
-        color = "red" if card.suit in ["Hearts", "Diamonds"] else "black"
+        color = "red" if suit in ["Hearts", "Diamonds"] else "black"
+    return {"label": f"{rank.upper()}{symbol}", "color": color, "title": CARD_TOOLTIPS.get(rank)}
+
+def _render_html(suit, rank):
+    """기호와 색상으로 표시하는 카드 HTML (카드 테이블 생성 시 한 번만 호출)"""
+    face = _card_face(suit, rank)
     # Add tooltip for special cards
-    tooltip = ""
-    if card.is_special():
-        rank = card.rank.lower()
-        if rank == "j":
-            tooltip = "플레이어를 선택해 패를 보고 한 장 버리기"
-        elif rank == "q":
-            tooltip = "레이즈 방향 역전"
-        elif rank == "k":
-            tooltip = "함께 내는 숫자에 +5 (역방향일 때 -5)"
-        elif rank == "joker":
-            tooltip = "마지막 플레이어 레이즈 값 카피 (점수 계산 X)"
-    if tooltip:
-        return f'<span title="{tooltip}" style="color: {color};">{card.rank.upper()}{symbol}</span>'
-    return f'<span style="color: {color};">{card.rank.upper()}{symbol}</span>'
+    if face["title"]:
+        return f'<span title="{face["title"]}" style="color: {face["color"]};">{face["label"]}</span>'
+    return f'<span style="color: {face["color"]};">{face["label"]}</span>'
+
+def card_to_html(card):
+    """Card 객체를 기호와 색상으로 표시하는 HTML 문자열 반환"""
+    return card.html
 
 class Card:
-    def __init__(self, suit, rank):
-        self.suit = suit  # "Hearts", "Diamonds", "Clubs", "Spades"
-        self.rank = rank  # 숫자: "1"~"10" 또는 특수: "j", "q", "k", "joker"
+    """Immutable playing card.
+
+    There are only 54 distinct cards, so every card is an interned singleton
+    from ``CARDS``; ``Card(suit, rank)`` returns the shared instance. HTML,
+    repr and numeric value are computed once when the table is built.
+    """
+    __slots__ = ("id", "suit", "rank", "special", "value", "html", "_repr")
+
+    def __new__(cls, suit, rank):
+        return CARD_INDEX[(suit, rank.lower())]
+
+    @classmethod
+    def _make(cls, card_id, suit, rank):
+        card = object.__new__(cls)
+        special = rank in SPECIAL_RANKS
+        for name, value in (
+            ("id", card_id),
+            ("suit", suit),          # "Hearts", "Diamonds", "Clubs", "Spades" / joker: "Black", "Color"
+            ("rank", rank),          # 숫자: "1"~"10" 또는 특수: "j", "q", "k", "joker"
+            ("special", special),
+            ("value", None if special else int(rank)),
+            ("html", _render_html(suit, rank)),
+            ("_repr", rank.upper() if special else f"{rank} of {suit}"),
+        ):
+            object.__setattr__(card, name, value)
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+
+    def __reduce__(self):
+        return (card_from_id, (self.id,))
 
     def __repr__(self):
-        if self.is_special():
-            return f"{self.rank.upper()}"
-        if self.suit:
-            return f"{self.rank} of {self.suit}"
-        return f"{self.rank}"
+        return self._repr
 
     def is_special(self):
-        return self.rank.lower() in ["j", "q", "k", "joker"]
+        return self.special
 
     def numeric_value(self):
-        if not self.is_special():
-            return int(self.rank)
-        return None
-    
+        return self.value
+
+def _build_card_table():
+    specs = [(suit, str(rank)) for suit in SUITS for rank in range(1, 11)]
+    specs += [(suit, rank) for suit in SUITS for rank in ("j", "q", "k")]
+    specs += [("Black", "joker"), ("Color", "joker")]
+    return tuple(Card._make(i, suit, rank) for i, (suit, rank) in enumerate(specs))
+
+CARDS = _build_card_table()                       # card id -> Card
+CARD_INDEX = {(c.suit, c.rank): c for c in CARDS}  # (suit, rank) -> Card
+
+def card_table():
+    """Display info for every card, indexed by card id (served to clients once)."""
+    return [_card_face(card.suit, card.rank) for card in CARDS]
+
+def card_from_id(card_id):
+    return CARDS[card_id]
+
+def evaluate_raise(selected_cards, current_highest, reversed_, max_cards_per_play):
+    """Check a raise against the rules without changing any state.
+
+    Returns ``(error_message, value, special_effect, new_reversed)``;
+    ``error_message`` is None when the raise is legal.
+    """
+    special_cards = [card for card in selected_cards if card.is_special()]
+    numeric_cards = [card for card in selected_cards if not card.is_special()]
+    if len(special_cards) > 1:
+        return "한 번에 특수 카드는 최대 1장만 사용할 수 있습니다.", None, None, reversed_
+    allowed = max_cards_per_play if not special_cards else max_cards_per_play + 1
+    if len(selected_cards) > allowed:
+        return (f"한 번에 낼 수 있는 전체 카드 수는 숫자 카드 {max_cards_per_play}장, 특수 카드 1장 입니다.",
+                None, None, reversed_)
+    if special_cards and not numeric_cards:
+        return "특수 카드는 반드시 숫자 카드와 함께 제출해야 합니다.", None, None, reversed_
+
+    value = sum(card.numeric_value() for card in numeric_cards)
+    special_effect = None
+    new_reversed = reversed_
+
+    if special_cards:
+        rank = special_cards[0].rank
+        if rank == "q":
+            special_effect = "Q"
+            new_reversed = not reversed_
+        elif rank == "k":
+            special_effect = "K"
+            # 정방향이면 value에 5를 더하고, 역방향이면 5를 뺍니다.
+            if not reversed_:
+                value += 5
+            else:
+                value -= 5
+        elif rank == "joker":
+            special_effect = "joker"
+            if not reversed_:
+                value += current_highest
+            else:
+                value = current_highest - value
+
+    if not new_reversed:
+        if value <= current_highest:
+            return f"제출한 숫자({value})는 현재 최고({current_highest})보다 커야 합니다.", value, special_effect, new_reversed
+    else:
+        if value >= current_highest:
+            return f"(q 효과) 제출한 숫자({value})는 현재 최고({current_highest})보다 작아야 합니다.", value, special_effect, new_reversed
+
+    # After passing the numeric comparison, handle J effect last
+    # (대상 선택은 engine 이 Game.j_pending / j_target 으로 관리)
+    if special_cards and special_cards[0].rank == "j":
+        special_effect = "J"
+    return None, value, special_effect, new_reversed
+
 class Deck:
+    """Draw pile and discard pile stored as compact arrays of card ids.
+
+    Cards leaving play (un-scored bets, mulligan / J discards, cards of
+    players who left) are pushed onto ``discards`` as they happen, so a
+    refresh is just a shuffle of the discard pile.
+    """
+    refreshes_total = 0    # 프로세스 전체 덱 리프레시 횟수 (/metrics)
+
     def __init__(self, game=None):
         self.game = game
-        self.cards = []
+        # 게임 소유 RNG – seed 와 행동 로그만으로 게임을 재현할 수 있다
+        self.rng = game.rng if game is not None else random.Random()
+        self.cards = array('B')       # draw pile, top of deck = last element
+        self.discards = array('B')    # cards out of play, reshuffled on refresh
+        self.refresh_count = 0
         self._build_full_deck()
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def _build_full_deck(self):
-        self.cards = []
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        for suit in suits:
-            for rank in map(str, range(1, 11)):
-                self.cards.append(Card(suit, rank))
-        for suit in suits:
-            for rank in ["j", "q", "k"]:
-                self.cards.append(Card(suit, rank))
-        self.cards.append(Card("Black", "joker"))
-        self.cards.append(Card("Color", "joker"))
-    
-    def refresh_deck(self, game):
-        full = {}
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        # 전체 덱 구성
-        for suit in suits:
-            for rank in map(str, range(1, 11)):
-                full[(suit, rank)] = full.get((suit, rank), 0) + 1
-        for suit in suits:
-            for rank in ["j", "q", "k"]:
-                full[(suit, rank)] = 1
-        full[( "Black", "joker")] = 1
-        full[( "Color", "joker")] = 1
-
-        in_play = {}
-        def add_card(card):
-            key = (card.suit, card.rank)
-            in_play[key] = in_play.get(key, 0) + 1
-
-        for p in game.players:
-            for card in p.hand:
-                add_card(card)
-            for card in p.score_cards:
-                add_card(card)
-        if game.current_round is not None:
-            for entry in game.current_round.bet_history:
-                for card in entry[1]:
-                    add_card(card)
-                    
-        remaining = []
-        for key, count in full.items():
-            remain = count - in_play.get(key, 0)
-            for _ in range(remain):
-                remaining.append(Card(key[0], key[1]))
-        random.shuffle(remaining)
+        self.cards = array('B', range(len(CARDS)))
+        self.discards = array('B')
+
+    def discard(self, cards):
+        """Return cards that left play to the discard pile."""
+        self.discards.extend(card.id for card in cards)
+
+    def refresh_deck(self, game=None):
+        # 버려진 카드 더미를 섞어 새 덱으로 사용
+        remaining = self.discards
+        if not remaining:
+            return
+        self.rng.shuffle(remaining)
+        remaining.extend(self.cards)
         self.cards = remaining
+        self.discards = array('B')
+        self.refresh_count += 1
+        Deck.refreshes_total += 1
 
     def draw(self, n=1):
         drawn = []
         for _ in range(n):
-            if len(self.cards) < 1 and self.game:
+            if len(self.cards) < 1:
                 self.refresh_deck(self.game)
                 if len(self.cards) < 1:
                     break
-            drawn.append(self.cards.pop())
+            drawn.append(CARDS[self.cards.pop()])
         return drawn
+
 class Player:
-    def __init__(self, name: str, pid: str | None = None):
+    def __init__(self, name: str, pid: str | None = None, is_bot: bool = False):
         # Unique identifier independent of display name
         self.id: str = pid or str(uuid.uuid4())
         self.name: str = name
+        self.is_bot: bool = is_bot
         self.hand = []              
         self.score_cards = []       
         self.total_points = 0
@@ -151,8 +254,9 @@ class Player:
             self.hand.extend(new_cards)
 
 class Round:
-    def __init__(self, players, deck, first_player_index, cfg):
+    def __init__(self, players, deck, first_player_index, cfg, stats=None):
         self.cfg = cfg
+        self.stats = stats      # Game.stats – 누적 통계 (없으면 기록 안 함)
         self.players = players
         self.deck = deck
         self.first_player_index = first_player_index
@@ -161,9 +265,11 @@ class Round:
         self.bet_history = []  # (플레이어 이름, [Card, ...], 숫자 합, 특수 효과)
         # Use player.id as key to avoid name collision across games
         self.active_players = {p.id: p for p in players}
+        self.last_bet = {}      # player.id -> 해당 플레이어의 마지막 bet_history 항목
         self.round_over = False
         self.winner = None
         self.reversed = False
+        self.scored_cards = []  # 승리자가 점수 카드로 가져간 카드
 
     def next_player(self):
         n = len(self.players)
@@ -182,58 +288,21 @@ class Round:
         except IndexError:
             return False, "잘못된 카드 인덱스입니다."
         
-        special_cards = [card for card in selected_cards if card.is_special()]
-        numeric_cards = [card for card in selected_cards if not card.is_special()]
-        if len(special_cards) > 1:
-            return False, "한 번에 특수 카드는 최대 1장만 사용할 수 있습니다."
-        allowed = self.cfg.max_cards_per_play if not special_cards else self.cfg.max_cards_per_play + 1
-        if len(selected_cards) > allowed:
-            return False, f"한 번에 낼 수 있는 전체 카드 수는 숫자 카드 {self.cfg.max_cards_per_play}장, 특수 카드 1장 입니다."
-        if special_cards and not numeric_cards:
-            return False, "특수 카드는 반드시 숫자 카드와 함께 제출해야 합니다."
-        
-        value = sum(card.numeric_value() for card in numeric_cards)
-        special_effect = None
-        new_reversed = self.reversed
-
-        if special_cards:
-            sp = special_cards[0]
-            rank = sp.rank.lower()
-            if rank == "q":
-                special_effect = "Q"
-                new_reversed = not self.reversed
-            elif rank == "k":
-                special_effect = "K"
-                # 정방향이면 value에 5를 더하고, 역방향이면 5를 뺍니다.
-                if not self.reversed:
-                    value += 5
-                else:
-                    value -= 5
-            elif rank == "joker":
-                special_effect = "joker"
-                if not self.reversed:
-                    value += self.current_highest
-                else:
-                    value = self.current_highest - value
-
-        if not new_reversed:
-            if value <= self.current_highest:
-                return False, f"제출한 숫자({value})는 현재 최고({self.current_highest})보다 커야 합니다."
-        else:
-            if value >= self.current_highest:
-                return False, f"(q 효과) 제출한 숫자({value})는 현재 최고({self.current_highest})보다 작아야 합니다."
-        
-        # After passing the numeric comparison, handle J effect last
-        if special_cards and special_cards[0].rank.lower() == "j":
-            special_effect = "J"
-            session['pending_j'] = True
+        error, value, special_effect, new_reversed = evaluate_raise(
+            selected_cards, self.current_highest, self.reversed, self.cfg.max_cards_per_play)
+        if error:
+            return False, error
 
-        self.bet_history.append((player.name, selected_cards, value, special_effect))
+        entry = (player.name, selected_cards, value, special_effect)
+        self.bet_history.append(entry)
+        self.last_bet[player.id] = entry
         self.current_highest = value
         self.reversed = new_reversed
         player.current_bet_cards = selected_cards
         player.has_raised = True
         player.last_action = "배팅"
+        if self.stats is not None:
+            self.stats.raised(player, special_effect)
         selected_set = set(selected_card_indices)
         player.hand = [card for i, card in enumerate(player.hand) if i not in selected_set]
         return True, "raise 제출 완료."
@@ -242,6 +311,8 @@ class Round:
         if player.id in self.active_players:
             del self.active_players[player.id]
         player.last_action = "폴드"
+        if self.stats is not None:
+            self.stats.folded(player)
         return True, "fold 처리 완료."
 
     # ---- called when player leaves room mid‑round ------------------
@@ -274,62 +345,107 @@ class Round:
         # 그 외의 경우(활성 플레이어 2명 이상)에는 라운드를 종료하지 않음.
         return False
 
+    def spent_cards(self):
+        """Bet cards that go to the discard pile once the round is over."""
+        scored = {card.id for card in self.scored_cards}
+        return [card for entry in self.bet_history for card in entry[1] if card.id not in scored]
+
     def finish_round(self):
         if not self.winner:
             return
-        winner_bets = [entry for entry in self.bet_history if entry[0] == self.winner.name]
-        if not winner_bets:
+        winner_bet = self.last_bet.get(self.winner.id)
+        if not winner_bet:
             return
         # 승리 라운드의 마지막 배팅 항목을 가져와 unpack
-        _, cards, value, special_effect = winner_bets[-1]
+        _, cards, value, special_effect = winner_bet
         # 카드들의 숫자 값만 합산하여 기본 점수 계산
         base_score = sum(card.numeric_value() for card in cards if card.numeric_value() is not None)
         ace_count = sum(1 for card in cards if not card.is_special() and card.rank == "1")
         ace_bonus = ace_count * 4
-        total_score = base_score + ace_bonus
-        if special_effect == 'K' :
-            total_score += 5
+        k_bonus = 5 if special_effect == 'K' else 0
+        total_score = base_score + ace_bonus + k_bonus
         # 승리자에게 점수 부여
         self.winner.total_points += total_score
+        if self.stats is not None:
+            self.stats.round_won(self.winner, value, total_score, ace_bonus, k_bonus)
         # 승리자의 제출 카드 중, 숫자 카드와 k 카드는 점수 카드로 획득
         score_cards_to_add = []
         for card in cards:
             if not card.is_special():
                 score_cards_to_add.append(card)
-            elif card.is_special() and card.rank.lower() == "k":
+            elif card.is_special() and card.rank == "k":
                 score_cards_to_add.append(card)
         self.winner.score_cards.extend(score_cards_to_add)
+        self.scored_cards = score_cards_to_add
         # 라운드 종료 후 모든 플레이어 패를 지정된 hand_count 까지 보충
         for p in self.players:
             p.draw_to_handcount(self.deck, self.cfg.hand_count)
 
 class Game:
-    def __init__(self, cfg: GameConfig | None = None, room_id: str | None = None):
+    def __init__(self, cfg: GameConfig | None = None, room_id: str | None = None, seed: int | None = None):
         self.cfg = cfg or GameConfig()
         self.room_id = room_id  
+        # 모든 무작위성(셔플, 첫 플레이어)은 이 RNG 에서 – seed + log 로 재현 가능
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.log = ActionLog()        # append-only, replay.py 참고
+        self.seats: list[str] = []    # join-order seat number -> player_id (log 에서 사용)
         self.deck = Deck(self)
         self.players = []
+        self.players_by_id: dict[str, Player] = {}
+        self.players_by_name: dict[str, Player] = {}
         self.current_round = None
         self.first_player_index = None
         self.round_history = []
+        self.stats = GameStats()      # 누적 통계 – 이벤트마다 O(1) 갱신 (stats.py)
         self.game_over = False
         # per‑game transient state
-        self.j_pending: dict[str, bool] = {}          # player_name -> True/False
-        self.mulligan_info: dict[str, dict] = {}      # player_name -> {'pending': bool, 'cards': [...]}
+        self.j_pending: dict[str, bool] = {}          # player_id -> True/False
+        self.j_target: dict[str, str] = {}            # player_id -> J 대상 플레이어 이름
+        self.mulligan_info: dict[str, dict] = {}      # player_id -> {'pending': bool, 'cards': [Card, ...]}
         self.info_message: str | None = None          # one‑shot broadcast message
         self.aborted = False     # True if game stopped because of insufficient players
+        # state versioning for delta updates
+        self.version = 0                              # bumped on every broadcast state change
+        self.client_views: dict[str, dict] = {}       # player_id -> {'version', 'state', 'acked'}
+
+    def __getstate__(self):
+        # client_views 는 소켓 전송용 캐시이므로 게임 상태 복사/피클에서 제외
+        state = self.__dict__.copy()
+        state["client_views"] = {}
+        return state
+
+    def get_player(self, name: str | None) -> "Player | None":
+        return self.players_by_name.get(name)
+
+    def seat_of(self, player: "Player") -> int:
+        return self.seats.index(player.id)
+
+    def bump_version(self) -> int:
+        """Advance the monotonically increasing state version."""
+        self.version += 1
+        return self.version
 
     def add_player(self, player: "Player"):
         # Reject if room is full
         if len(self.players) >= self.cfg.player_count:
             return False
         # Reject if another player already has the same display name
-        if any(p.name == player.name for p in self.players):
+        if player.name in self.players_by_name:
             return False
         self.players.append(player)
+        self.players_by_id[player.id] = player
+        self.players_by_name[player.name] = player
+        self.stats.add_player(player)
+        payload = bytearray((player.is_bot,))
+        write_str(payload, player.id)
+        write_str(payload, player.name)
+        self.log.append(OP_JOIN, len(self.seats), payload)
+        self.seats.append(player.id)
         return True
 
     def start_round(self):
+        self.log.append(OP_START, 0)
         for player in self.players:
             player.draw_to_handcount(self.deck, self.cfg.hand_count)
             player.current_bet_cards = []
@@ -338,32 +454,63 @@ class Game:
             player.mulligan_used = False
             player.last_action = "대기"
         if self.first_player_index is None:
-            self.first_player_index = random.randint(0, len(self.players)-1)
+            self.first_player_index = self.rng.randint(0, len(self.players)-1)
         starting_player = self.players[self.first_player_index]
         starting_player.starting_count += 1
-        self.current_round = Round(self.players, self.deck, self.first_player_index, self.cfg)
+        self.stats.round_started(self.players)
+        self.current_round = Round(self.players, self.deck, self.first_player_index, self.cfg, self.stats)
         return self.current_round
 
     def end_round(self):
         if self.current_round:
             self.current_round.finish_round()
+            self.deck.discard(self.current_round.spent_cards())
             self.round_history.append({
                 "winner": self.current_round.winner.name if self.current_round.winner else None,
                 "highest": self.current_round.current_highest
             })
+            self.stats.round_ended(self.current_round)
             self.first_player_index = (self.first_player_index + 1) % len(self.players)
             self.current_round = None
             if all(p.starting_count >= self.cfg.first_player_threshold for p in self.players):
                 self.game_over = True
 
     # ---- player leaves during an active game -----------------------
+    def replace_with_bot(self, player_name: str) -> bool:
+        """Hand a leaving player's seat to a bot; returns False if not seated."""
+        player_obj = self.players_by_name.get(player_name)
+        if not player_obj:
+            return False
+        player_obj.is_bot = True
+        self.client_views.pop(player_obj.id, None)
+        self.log.append(OP_BOT, self.seat_of(player_obj))
+        return True
+
+    def reclaim_from_bot(self, player_name: str) -> bool:
+        """A player takes back the seat a bot was playing; returns False if not seated."""
+        player_obj = self.players_by_name.get(player_name)
+        if not player_obj:
+            return False
+        if player_obj.is_bot:
+            player_obj.is_bot = False
+            self.log.append(OP_HUMAN, self.seat_of(player_obj))
+        return True
+
     def remove_player(self, player_name: str):
         """Called when a participant leaves; returns True if game was aborted."""
-        player_obj = next((p for p in self.players if p.name == player_name), None)
+        player_obj = self.players_by_name.pop(player_name, None)
         if not player_obj:
             return False
+        self.log.append(OP_LEAVE, self.seat_of(player_obj))
+        self.stats.remove_player(player_obj)
+        self.players_by_id.pop(player_obj.id, None)
         # Remove from list
         self.players = [p for p in self.players if p.id != player_obj.id]
+        self.client_views.pop(player_obj.id, None)
+        for per_player in (self.j_pending, self.j_target, self.mulligan_info):
+            per_player.pop(player_obj.id, None)
+        self.deck.discard(player_obj.hand)
+        self.deck.discard(player_obj.score_cards)
         # also from current round
         if self.current_round:
             self.current_round.remove_player(player_obj)
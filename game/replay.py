@@ -0,0 +1,99 @@
+"""Deterministic replay from seed + action log.
+
+A ``Game`` draws all randomness from ``Game.rng`` (seeded with ``Game.seed``)
+and appends every state change to ``Game.log`` (see ``actionlog.py``).
+Re-running the log against a fresh game with the same seed rebuilds the
+exact state, including hands, deck order and scores, without any of the
+socket or HTTP work.
+
+``export_game`` packs config, seed and log into a small blob. Routes serve
+it at ``/debug/replay/<room_id>``. To replay a blob (from the ``game``
+directory)::
+
+    python replay.py dump.bin [--upto N] [--realtime]
+"""
+import argparse
+import dataclasses
+import pickle
+import time
+import zlib
+
+import engine
+from actionlog import (ActionLog, OP_ACT, OP_BOT, OP_HUMAN, OP_JOIN, OP_LEAVE, OP_NAMES, OP_START,
+                       read_str)
+from models import Game, GameConfig, Player
+
+REPLAY_FORMAT = 1
+
+def _apply_entry(game, op, seat, payload):
+    if op == OP_JOIN:
+        pid, pos = read_str(payload, 1)
+        name, _ = read_str(payload, pos)
+        game.add_player(Player(name, pid=pid, is_bot=bool(payload[0])))
+        return
+    if op == OP_START:
+        game.start_round()
+        return
+    player = game.players_by_id[game.seats[seat]]
+    if op == OP_ACT:
+        _, events = engine.apply(game, player, engine.decode_action(game, payload))
+        if events[0]["type"] == "error":
+            raise ValueError(f"replay diverged at seat {seat}: {events[0]['message']}")
+    elif op == OP_BOT:
+        game.replace_with_bot(player.name)
+    elif op == OP_HUMAN:
+        game.reclaim_from_bot(player.name)
+    elif op == OP_LEAVE:
+        game.remove_player(player.name)
+
+def replay(cfg, seed, log, room_id=None, upto=None, realtime=False):
+    """Rebuild a game from ``seed`` and the first ``upto`` entries of ``log``.
+
+    With ``realtime`` the original gaps between entries are slept, which
+    turns a recorded game into paced load for performance tests.
+    """
+    game = Game(cfg, room_id, seed=seed)
+    for i, (op, seat, elapsed, payload) in enumerate(ActionLog(log)):
+        if upto is not None and i >= upto:
+            break
+        if realtime and elapsed:
+            time.sleep(elapsed / 1000)
+        _apply_entry(game, op, seat, payload)
+    return game
+
+def export_game(game):
+    """Config, seed and action log of ``game`` as one compressed blob."""
+    state = (REPLAY_FORMAT, dataclasses.asdict(game.cfg), game.room_id, game.seed, bytes(game.log))
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+def load_export(data):
+    """``(cfg, room_id, seed, log)`` from ``export_game`` output."""
+    fmt, cfg, room_id, seed, log = pickle.loads(zlib.decompress(data))
+    if fmt != REPLAY_FORMAT:
+        raise ValueError(f"unsupported replay format {fmt}")
+    return GameConfig(**cfg), room_id, seed, log
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dump", help="file written from /debug/replay/<room_id>")
+    parser.add_argument("--upto", type=int, help="stop after this many log entries")
+    parser.add_argument("--realtime", action="store_true", help="keep the recorded pacing")
+    args = parser.parse_args(argv)
+    with open(args.dump, "rb") as f:
+        cfg, room_id, seed, log = load_export(f.read())
+    entries = list(ActionLog(log))
+    recorded_s = sum(e[2] for e in entries[:args.upto]) / 1000
+    start = time.perf_counter()
+    game = replay(cfg, seed, log, room_id, args.upto, args.realtime)
+    elapsed = time.perf_counter() - start
+    counts = {}
+    for op, *_ in entries[:args.upto]:
+        counts[OP_NAMES[op]] = counts.get(OP_NAMES[op], 0) + 1
+    print(f"room {room_id}: {len(entries)} entries ({len(log)} bytes) {counts}")
+    print(f"replayed in {elapsed * 1e3:.1f} ms, recorded {recorded_s:.1f} s"
+          + (f" ({recorded_s / elapsed:.0f}x real time)" if elapsed and recorded_s else ""))
+    print(f"rounds {len(game.round_history)}, game_over {game.game_over}, scores "
+          + ", ".join(f"{p.name}={p.total_points}" for p in game.players))
+
+if __name__ == "__main__":
+    main()
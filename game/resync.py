@@ -0,0 +1,68 @@
+"""Rate-limited admission for full-state resyncs.
+
+After a worker restart or a network blip every client reconnects at once.
+Clients that only missed a few versions are caught up from their patch
+buffer right away (see ``routes.connect_player``). The rest need a full
+snapshot, and those are admitted here at ``rate`` per second (token
+bucket, ``burst`` at once), so a reconnect storm cannot crowd live turns
+out of the room queues. Requests are keyed by ``(room_id, player_id)``:
+a client that reconnects again while waiting is served only once.
+"""
+import threading
+import time
+
+class ResyncLimiter:
+    def __init__(self, socketio, rate=200.0, burst=50, tick=0.02, clock=time.monotonic):
+        self.socketio = socketio
+        self.rate = rate
+        self.burst = burst
+        self.tick = tick
+        self.clock = clock
+        self.tokens = float(burst)
+        self._last = clock()
+        self.pending: dict = {}       # key -> fn, 요청 순서대로 처리 (FIFO)
+        self.admitted = 0
+        self.deduped = 0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def request(self, key, fn):
+        """Run ``fn()`` now if a token is free and nobody is queued, else queue it."""
+        with self._lock:
+            if key in self.pending:
+                self.deduped += 1
+                return
+            self._refill()
+            if self.pending or self.tokens < 1:
+                self.pending[key] = fn
+                return
+            self.tokens -= 1
+            self.admitted += 1
+        fn()
+
+    def admit(self):
+        """Run as many queued requests as the bucket allows; returns how many ran."""
+        ready = []
+        with self._lock:
+            self._refill()
+            while self.pending and self.tokens >= 1:
+                key = next(iter(self.pending))
+                ready.append(self.pending.pop(key))
+                self.tokens -= 1
+            self.admitted += len(ready)
+        for fn in ready:
+            fn()
+        return len(ready)
+
+    def run(self):
+        while True:
+            self.socketio.sleep(self.tick)
+            self.admit()
+
+    def stats(self):
+        return {"pending": len(self.pending), "admitted": self.admitted, "deduped": self.deduped,
+                "tokens": round(self.tokens, 2)}
@@ -0,0 +1,67 @@
+"""Public room index for the room list.
+
+``RoomIndex`` keeps a summary of every public waiting room in creation
+order. Routes call ``sync(room_id)`` after each room command; the index
+compares the room against its stored summary and reports whether it was
+added, updated or removed, so the caller can push just that change to the
+room-list channel. Pages are read with a creation-sequence cursor
+(``after``), so a page costs O(log n + limit) no matter how many rooms
+exist.
+"""
+import bisect
+import itertools
+
+class RoomIndex:
+    def __init__(self, waiting_rooms):
+        self.waiting_rooms = waiting_rooms
+        self.summaries: dict[str, dict] = {}
+        self._order: list[tuple[int, str]] = []     # (seq, room_id), seq 오름차순
+        self._seq = itertools.count(1)
+        for room_id in list(waiting_rooms):
+            self.sync(room_id)
+
+    @staticmethod
+    def summarize(room_id, info, seq):
+        cfg = info['config']
+        return {
+            "id": room_id,
+            "title": cfg.title,
+            "players": len(info['joiners']),
+            "capacity": cfg.player_count,
+            "seq": seq,
+        }
+
+    def sync(self, room_id):
+        """Bring ``room_id``'s entry up to date; returns ``(op, payload)`` or None.
+
+        ``op`` is "add", "update" (payload = summary) or "remove" (payload = room id).
+        """
+        info = self.waiting_rooms.get(room_id)
+        old = self.summaries.get(room_id)
+        if info is None or info['config'].private:
+            if old is None:
+                return None
+            del self.summaries[room_id]
+            i = bisect.bisect_left(self._order, (old["seq"], room_id))
+            del self._order[i]
+            return "remove", room_id
+        if old is None:
+            summary = self.summarize(room_id, info, next(self._seq))
+            self.summaries[room_id] = summary
+            self._order.append((summary["seq"], room_id))
+            return "add", summary
+        summary = self.summarize(room_id, info, old["seq"])
+        if summary == old:
+            return None
+        self.summaries[room_id] = summary
+        return "update", summary
+
+    def page(self, after=0, limit=20):
+        """Up to ``limit`` rooms created after cursor ``after``, plus the next cursor."""
+        i = bisect.bisect_left(self._order, (after + 1, ""))
+        rooms = [self.summaries[rid] for _, rid in self._order[i:i + limit]]
+        more = i + limit < len(self._order)
+        return rooms, (rooms[-1]["seq"] if more else None)
+
+    def __len__(self):
+        return len(self._order)
@@ -1,7 +1,28 @@
-from flask import render_template, request, session, redirect, url_for
-from flask_socketio import emit, join_room
-from models import Player, Game, GameConfig
-import secrets
+import dataclasses
+import functools
+import hashlib
+import itertools
+import json
+import time
+from collections import deque
+from flask import (render_template, request, session, redirect, url_for, has_request_context,
+                   copy_current_request_context, jsonify, Response, g)
+from flask_socketio import join_room
+from models import Player, Game, GameConfig, Deck, card_table, check_config
+from state import public_state, private_state
+import engine
+import bots
+import atexit
+from store import MemoryStore, SQLiteStore
+from shard import ShardConfig
+from actors import RoomCommandQueues
+from sweeper import RoomSweeper
+from roomindex import RoomIndex
+from metrics import Registry, BYTES_BUCKETS, COUNT_BUCKETS
+from replay import export_game
+from sessions import SessionStore
+from tournament import Tournament, standings
+from resync import ResyncLimiter
 
 def error_response(message):
     return f'''
@@ -21,11 +42,65 @@ def error_response(message):
 # Error flash mechanism for game screen
 def flash_error(msg):
     """Store a one‑shot error message to be sent with next socket payload."""
-    session['error_message'] = msg
+    session_data.set(session.get('sid'), 'error_message', msg)
+
+# ── Delta updates ───────────────────────────────────
+# 클라이언트가 이 버전 수 이상 ack 하지 않으면 patch 대신 전체 스냅샷 전송
+MAX_UNACKED_PATCHES = 8
+# 재연결한 클라이언트에게 다시 보낼 수 있도록 플레이어마다 보관하는 최근 patch 수
+RESUME_BUFFER = 32
+
+def state_patch(old, new):
+    """Return a JSON merge patch (RFC 7386) turning ``old`` into ``new``.
+
+    Nested dicts are diffed recursively; lists and scalars are replaced
+    wholesale. Removed keys and ``None`` values are both encoded as ``None``,
+    which the client treats the same way.
+    """
+    patch = {}
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    for key, value in new.items():
+        prev = old.get(key)
+        if isinstance(value, dict) and isinstance(prev, dict):
+            sub = state_patch(prev, value)
+            if sub:
+                patch[key] = sub
+        elif key not in old or prev != value:
+            patch[key] = value
+    return patch
+
+def merge_patches(first, second):
+    """Compose two merge patches into one with the same effect, or None.
+
+    Applying the result equals applying ``first`` then ``second`` (treating
+    a None value and a missing key as the same). It returns None when
+    ``second`` merges a dict into a key that ``first`` replaced with a
+    non-dict value; one merge patch cannot express that.
+    """
+    merged = dict(first)
+    for key, value in second.items():
+        if isinstance(value, dict) and key in merged:
+            if not isinstance(merged[key], dict):
+                return None
+            value = merge_patches(merged[key], value)
+            if value is None:
+                return None
+        merged[key] = value
+    return merged
+
+# 공개 방 목록 변경(add/update/remove)을 받는 Socket.IO 채널
+ROOM_LIST_CHANNEL = "room_list"
+ROOM_PAGE_SIZE = 20
 
 # ── Multi‑room containers ───────────────────────────
-waiting_rooms = {}   # room_id -> {'config': GameConfig, 'joiners': [str]}
-games         = {}   # room_id -> Game
+# register_routes 에서 STORE_PATH 설정 시 SQLite 저장소로 교체된다
+waiting_rooms = MemoryStore()   # room_id -> {'config': GameConfig, 'joiners': [str], 'bots': {str}}
+games         = MemoryStore()   # room_id -> Game
+# 쿠키에는 신원(sid, player_name, room_id)만, 일회성 상태는 서버에 보관
+session_data  = SessionStore()
+tournaments   = {}              # tournament_id -> Tournament (메모리에만 보관)
 
 def current_game():
     rid = session.get('room_id')
@@ -36,99 +111,562 @@ def player_room(game: Game, player) -> str:
     """Return unique socket room for a player inside its game."""
     return f"{game.room_id}:{player.id}"
 
+# Helper: room-wide channel for spectators (hidden-hand public view)
+def spectator_room(game: Game) -> str:
+    return f"{game.room_id}:watch"
+
+def configure_store(app, socketio):
+    """Swap the room containers for persistent stores if STORE_PATH is set."""
+    global waiting_rooms, games
+    path = app.config.get("STORE_PATH")
+    if not path:
+        return
+    waiting_rooms, games = SQLiteStore.open_pair(path, app.config.get("STORE_BATCH_SIZE", 32))
+
+    def flush_stores():
+        waiting_rooms.flush()
+        games.flush()
+
+    def flush_periodically():
+        while True:
+            socketio.sleep(app.config.get("STORE_FLUSH_INTERVAL", 1.0))
+            flush_stores()
+
+    socketio.start_background_task(flush_periodically)
+    atexit.register(flush_stores)
+
 def register_routes(app, socketio):
-    def get_state_for(game, player_name):
-        """특정 플레이어에게만 전송할 게임 상태 생성"""
-        # 현재 라운드가 없으면 기본 메시지
+    configure_store(app, socketio)
+    shard = app.config.get("SHARD") or ShardConfig()
+    commands = RoomCommandQueues(socketio)
+    app.extensions["room_commands"] = commands
+    sweeper = RoomSweeper(waiting_rooms, games,
+                          idle_ttl=app.config.get("ROOM_IDLE_TTL", 1800.0),
+                          finished_ttl=app.config.get("ROOM_FINISHED_TTL", 300.0))
+    app.extensions["room_sweeper"] = sweeper
+    session_data.ttl = app.config.get("SESSION_TTL", session_data.ttl)
+    # 전체 스냅샷 재동기화는 초당 RESYNC_RATE 개까지만 (재연결 폭주 대비)
+    resync = ResyncLimiter(socketio, app.config.get("RESYNC_RATE", 200.0), app.config.get("RESYNC_BURST", 50))
+    app.extensions["resync"] = resync
+    socketio.start_background_task(resync.run)
+    room_index = RoomIndex(waiting_rooms)
+
+    # --- 카드 wire 형식: 상태에는 카드 id 만 싣고 표시 정보는 정적 테이블로 ---
+    card_wire = app.config.get("CARD_WIRE", "ids")
+    card_table_json = json.dumps(card_table(), ensure_ascii=False)
+    card_table_version = hashlib.sha1(card_table_json.encode()).hexdigest()[:12]
+    app.jinja_env.globals.update(card_table_url=f"/cards.json?v={card_table_version}")
+
+    # --- 계측: /metrics (Prometheus text format) ---------------------
+    metrics = Registry()
+    app.extensions["metrics"] = metrics
+    http_seconds = metrics.histogram("trumpout_http_request_duration_seconds",
+                                     "Flask route latency", ("endpoint",))
+    http_requests = metrics.counter("trumpout_http_requests_total",
+                                    "Flask responses by endpoint and status", ("endpoint", "status"))
+    socket_seconds = metrics.histogram("trumpout_socket_event_duration_seconds",
+                                       "Socket.IO handler latency", ("event",))
+    emits_total = metrics.counter("trumpout_emits_total", "Socket.IO emits by event", ("event",))
+    emit_bytes = metrics.histogram("trumpout_emit_payload_bytes",
+                                   "JSON payload size per emit (sampled, 1 in EMIT_SIZE_SAMPLE)",
+                                   ("event",), BYTES_BUCKETS)
+    broadcast_seconds = metrics.histogram("trumpout_broadcast_duration_seconds",
+                                          "Latency of one (merged) state push")
+    broadcast_emits = metrics.histogram("trumpout_broadcast_emits", "Emits per broadcast_game_state",
+                                        buckets=COUNT_BUCKETS)
+    broadcasts_merged = metrics.counter("trumpout_broadcasts_merged_total",
+                                        "State pushes folded into an already pending broadcast")
+    tournament_tables = metrics.counter("trumpout_tournament_tables_finished_total",
+                                        "Tournament tables that reached game over (rate = tables/s)")
+    metrics.callback("trumpout_rooms", "Rooms in memory",
+                     lambda: {("game",): len(games), ("waiting",): len(waiting_rooms)}, labels=("kind",))
+    metrics.callback("trumpout_players", "Seated players in running games",
+                     lambda: {("human",): sum(not p.is_bot for gm in list(games.values()) for p in gm.players),
+                              ("bot",): sum(p.is_bot for gm in list(games.values()) for p in gm.players)},
+                     labels=("kind",))
+    metrics.callback("trumpout_spectators", "Sockets watching a game",
+                     lambda: sum(len(sids) for sids in watchers.values()))
+    reconnects = metrics.counter("trumpout_reconnects_total",
+                                 "Player socket connects by how they were brought up to date",
+                                 ("outcome",))
+    metrics.callback("trumpout_resync_pending", "Full-state resyncs waiting for admission",
+                     lambda: len(resync.pending))
+    metrics.callback("trumpout_resyncs_deduped_total", "Resync requests merged into one already queued",
+                     lambda: resync.deduped, kind="counter")
+    metrics.callback("trumpout_mq_dropped_total", "Cross-worker messages the local queue could not deliver",
+                     lambda: {(reason,): n for reason, n
+                              in getattr(socketio.server.manager, "dropped", {}).items()},
+                     kind="counter", labels=("reason",))
+    metrics.callback("trumpout_sessions", "Server-side sessions held in memory", lambda: len(session_data))
+    metrics.callback("trumpout_deck_refreshes_total", "Discard pile reshuffles",
+                     lambda: Deck.refreshes_total, kind="counter")
+    metrics.callback("trumpout_command_queue_depth", "Commands waiting in room queues",
+                     lambda: sum(q["depth"] for q in commands.stats().values()))
+    metrics.callback("trumpout_rooms_evicted_total", "Rooms evicted by the TTL sweeper",
+                     lambda: {(reason,): n for reason, n in sweeper.evicted.items()},
+                     kind="counter", labels=("reason",))
+
+    socketio_emit = socketio.emit
+    # payload 크기는 N 번에 한 번만 잰다 – 매번 재면 emit 마다 json.dumps 가 한 번 더 돈다
+    emit_size_sample = app.config.get("EMIT_SIZE_SAMPLE", 16)
+    emit_seq = itertools.count()
+
+    def counted_emit(event, *args, **kwargs):
+        emits_total.inc(event)
+        if args and next(emit_seq) % emit_size_sample == 0:
+            emit_bytes.observe(len(json.dumps(args[0], separators=(",", ":"))), event)
+        return socketio_emit(event, *args, **kwargs)
+    socketio.emit = counted_emit     # flask_socketio.emit 도 이 메서드를 거친다
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.before_request
+    def ensure_session_id():
+        if 'sid' not in session:
+            session['sid'] = SessionStore.new_id()
+        session.pop('error_message', None)    # 예전 쿠키에 남은 일회성 상태 제거
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            endpoint = request.endpoint or "unknown"
+            http_seconds.observe(time.perf_counter() - started, endpoint)
+            http_requests.inc(endpoint, response.status_code)
+        return response
+
+    def on_event(event):
+        """``socketio.on`` with handler latency recorded per event."""
+        def decorator(handler):
+            @functools.wraps(handler)
+            def timed(*args, **kwargs):
+                with socket_seconds.time(event):
+                    return handler(*args, **kwargs)
+            return socketio.on(event)(timed)
+        return decorator
+
+    def publish_room_listing(room_id):
+        """Push this room's change (if any) to the room-list channel."""
+        change = room_index.sync(room_id)
+        if change:
+            op, payload = change
+            socketio.emit("room_list", {"op": op, "room": payload}, room=ROOM_LIST_CHANNEL)
+
+    def room_command(view):
+        """Run ``view`` on its room's command queue (room from the URL or the session).
+
+        Rooms that do not exist get no queue: the view runs directly and
+        answers its own "not found" (there is nothing to serialize).
+        """
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            rid = kwargs.get('room_id') or session.get('room_id')
+            if not rid or (rid not in games and rid not in waiting_rooms):
+                return view(*args, **kwargs)
+            sweeper.touch(rid)
+
+            def run():
+                try:
+                    return view(*args, **kwargs)
+                finally:
+                    publish_room_listing(rid)
+            return commands.submit(rid, copy_current_request_context(run))
+        return wrapper
+
+    # --- 샤드 라우팅: 다른 워커가 소유한 방 요청은 소유 워커로 보낸다 ---
+    @app.before_request
+    def route_to_owner_shard():
+        if not shard.sharded or request.endpoint in ('rooms', 'room_list', 'create', 'static', 'cards',
+                                                     'queue_stats', 'room_stats', 'metrics_text',
+                                                     'create_tournament', 'tournament_status'):
+            return None
+        room_id = (request.view_args or {}).get('room_id') or session.get('room_id')
+        if room_id and not shard.owns(room_id):
+            return redirect(shard.owner_url(room_id) + request.full_path.rstrip('?'), code=307)
+        return None
+
+    def get_state_for(game, player_name, public=None, error=None):
+        """특정 플레이어에게만 전송할 게임 상태 생성
+
+        ``public`` 이 주어지면 공개 상태를 재계산하지 않고 재사용한다.
+        """
+        if public is None:
+            public = public_state(game, card_wire)
         if not game.current_round:
-            return {
-                "message": "라운드가 종료되었습니다.",
-                "players": [p.name for p in game.players],
-            }
-        # 숫자 데이터들
-        recent_bets = [
-            {
-                "player": name,
-                "value": value,
-                "cards": [str(app.jinja_env.globals['card_to_html'](c)) for c in cards]
-            }
-            for name, cards, value, _ in game.current_round.bet_history[::-1]
-        ]
-        graph_data = [
-            {"value": value, "reversed": (effect == "reversed")}
-            for name, cards, value, effect in game.current_round.bet_history[::-1]
-        ]
-        # 해당 플레이어 손패만 포함
-        hand = []
-        player_obj = next((p for p in game.players if p.name == player_name), None)
-        pid = player_obj.id if player_obj else None
-        if player_obj:
-            hand = [str(app.jinja_env.globals['card_to_html'](c)) for c in player_obj.hand]
-
-        # 턴 순서 생성
-        turn_order = []
-        n = len(game.current_round.players)
-        start = game.current_round.first_player_index
-        for i in range(n):
-            turn_order.append(game.current_round.players[(start + i) % n].name)
-
-        # 다른 플레이어 정보
-        players = {
-            p.name: {
-                "남은 패": len(p.hand),
-                "누적 승점": p.total_points,
-                "행동": p.last_action,
-                "score_cards": [str(app.jinja_env.globals['card_to_html'](c)) for c in p.score_cards]
-            }
-            for p in game.players
-        }
+            return public
+        player_obj = game.get_player(player_name)
+        state = dict(public, **private_state(game, player_obj, card_wire))
+        # 오류 메시지는 요청을 발생시킨 플레이어에게만 전달
+        state["error_message"] = error
+        return state
 
-        return {
-            "first_player": game.current_round.players[start].name,
-            "current_turn": game.current_round.players[game.current_round.current_turn_index].name,
-            "turn_order": turn_order,
-            "recent_bets": recent_bets,
-            "graph_data": graph_data,
-            "total_rounds":     game.cfg.first_player_threshold * len(game.players),
-            "completed_rounds":  len(game.round_history),
-            "remaining_rounds": game.cfg.first_player_threshold * len(game.players) - sum(p.starting_count for p in game.players),
-            "players": players,
-            "pending_j": game.j_pending.get(pid, False),
-            "hand": hand,
-            "mulligan_cards": (
-                game.mulligan_info.get(pid, {}).get("cards")
-                if game.mulligan_info.get(pid, {}).get("pending") else None
-            ),
-            "j_candidates": (game.j_pending.get(pid, False) and 'j_target_hand' not in session)
-                            and [p.name for p in game.players if p.name != player_name] or None,
-            "j_target_hand": session.get('j_target_hand') if 'j_target' in session else None,
-            "j_target": session.get('j_target') if session.get('j_target') else None,
-            # 오류 메시지는 요청을 발생시킨 플레이어(세션의 player_name)에게만 전달
-            "error_message": session.get("error_message") if player_name == session.get("player_name") else None,
-            "game_over": game.game_over,
-            "info_message": game.info_message,
+    def emit_full_state(game, player, state):
+        """Send a full snapshot and remember it as the player's base view."""
+        state = dict(state, version=game.version)
+        game.client_views[player.id] = {
+            "version": game.version,
+            "state": state,
+            "acked": game.client_views.get(player.id, {}).get("acked", 0),
+            "patches": deque(maxlen=RESUME_BUFFER),   # (base, version, patch) – 재연결 시 재전송
         }
+        socketio.emit('game_state_update', state, room=player_room(game, player))
+
+    # --- 재연결 / 재동기화 -------------------------------------------
+    online_players = {}         # (room_id, player_id) -> 연결된 소켓 수
+
+    def resync_player(room_id, player_id):
+        """Runs on the room's queue once the limiter admits it: full snapshot for one player."""
+        game = games.get(room_id)
+        player = game.players_by_id.get(player_id) if game else None
+        if player and not player.is_bot:
+            emit_full_state(game, player, get_state_for(game, player.name))
+
+    def admit_resync(room_id, player_id):
+        if room_id in games:        # 기다리는 동안 방이 사라졌으면 큐를 새로 만들지 않는다
+            commands.post(room_id, functools.partial(resync_player, room_id, player_id))
+
+    def request_resync(game, player):
+        resync.request((game.room_id, player.id),
+                       functools.partial(admit_resync, game.room_id, player.id))
+
+    def resume_player(game, player, version):
+        """Bring a (re)connected player up to date; returns how ("current", "replay" or "snapshot")."""
+        view = game.client_views.get(player.id)
+        if view is None or version is None:
+            request_resync(game, player)
+            return "snapshot"
+        if version == view["version"]:
+            return "current"
+        # 놓친 patch 들을 하나로 합쳐 보낸다 – 버퍼에 없거나 합칠 수 없으면 스냅샷
+        missed = list(view["patches"])
+        start = next((i for i, (base, _, _) in enumerate(missed) if base == version), None)
+        patch = None
+        if start is not None:
+            patch = {}
+            for _, _, step_patch in missed[start:]:
+                patch = merge_patches(patch, step_patch)
+                if patch is None:
+                    break
+        if patch is None:
+            request_resync(game, player)
+            return "snapshot"
+        socketio.emit('game_state_patch', {"base": version, "version": view["version"], "patch": patch},
+                      to=request.sid)
+        return "replay"
+
+    # --- 방 단위 broadcast 병합 --------------------------------------
+    # BROADCAST_TICK 안에 일어난 상태 변경은 수신자마다 한 번의 emit 으로 합친다.
+    # 0 이면 병합 없이 즉시 전송.
+    broadcast_tick = app.config.get("BROADCAST_TICK", 0.02)
+    pending_broadcasts = {}     # room_id -> {player_name: error_message}
+    flushes_queued = set()      # room_id – flush_game_state 가 이미 방 큐에 올라가 있음
 
     def broadcast_game_state(game):
-        # 각 플레이어 방(room)으로 전송
+        """Schedule a state push for ``game``; pushes within one tick are merged."""
+        errors = pending_broadcasts.get(game.room_id)
+        if errors is None:
+            errors = pending_broadcasts[game.room_id] = {}
+        else:
+            broadcasts_merged.inc()
+        # 오류 메세지는 요청한 플레이어에게 1회 표시 후 제거
+        if has_request_context():
+            error = session_data.pop(session.get("sid"), "error_message")
+            if error:
+                errors[session.get("player_name")] = error
+        if not broadcast_tick:
+            flush_game_state(game.room_id)
+
+    # --- 관전자 ------------------------------------------------------
+    # 관전자 화면은 공개 상태뿐이라 버전마다 한 번만 만들고,
+    # spectator_room 으로 한 번 emit 한다 (python-socketio 가 패킷을 한 번만 인코딩).
+    watchers = {}           # room_id -> {socket sid}
+    spectator_views = {}    # room_id -> 관전자에게 마지막으로 보낸 상태
+
+    def spectator_state(game, public=None):
+        """Public view for spectators at the current version, built once per version."""
+        view = spectator_views.get(game.room_id)
+        if view is None or view["version"] != game.version:
+            view = dict(public or public_state(game, card_wire), version=game.version, error_message=None)
+            spectator_views[game.room_id] = view
+        return view
+
+    def push_spectator_state(game, public):
+        if not watchers.get(game.room_id):
+            spectator_views.pop(game.room_id, None)
+            return 0
+        prev = spectator_views.get(game.room_id)
+        view = spectator_state(game, public)
+        if prev is None:
+            socketio.emit('game_state_update', view, room=spectator_room(game))
+        else:
+            socketio.emit('game_state_patch',
+                          {"base": prev["version"], "version": view["version"],
+                           "patch": state_patch(prev, view)},
+                          room=spectator_room(game))
+        return 1
+
+    def flush_game_state(room_id):
+        """Runs on the room's queue: one patch (or snapshot) per player for all pending changes."""
+        flushes_queued.discard(room_id)
+        errors = pending_broadcasts.pop(room_id, None)
+        game = games.get(room_id)
+        if errors is None or game is None:
+            return
+        started = time.perf_counter()
+        sent = 0
+        game.bump_version()
+        games.mark_dirty(game.room_id)
+        # 공개 상태는 한 번만 계산하고 플레이어별 비공개 정보만 합친다
+        public = public_state(game, card_wire)
+        # 각 플레이어 방(room)으로 전송 – 마지막으로 보낸 상태 대비 patch만 전송
         for p in game.players:
-            socketio.emit(
-                'game_state_update',
-                get_state_for(game, p.name),
-                room=player_room(game, p)
-            )
+            if p.is_bot:
+                continue
+            state = get_state_for(game, p.name, public, errors.get(p.name))
+            view = game.client_views.get(p.id)
+            online = (room_id, p.id) in online_players
+            if not view or (online and view["version"] - view["acked"] >= MAX_UNACKED_PATCHES):
+                emit_full_state(game, p, state)
+                sent += 1
+                continue
+            state = dict(state, version=game.version)
+            patch = state_patch(view["state"], state)
+            view["patches"].append((view["version"], game.version, patch))
+            # 연결이 끊긴 플레이어는 patch 를 쌓아만 두고 재연결 때 한 번에 보낸다
+            if online:
+                socketio.emit(
+                    'game_state_patch',
+                    {"base": view["version"], "version": game.version, "patch": patch},
+                    room=player_room(game, p)
+                )
+                sent += 1
+            view["version"] = game.version
+            view["state"] = state
+        sent += push_spectator_state(game, public)
         # 게임 종료시 별도 이벤트 broadcast
         if game.game_over:
             for p in game.players:
                 socketio.emit('game_over', {}, room=player_room(game, p))
-        # 오류 메세지는 1회 표시 후 제거
-        session.pop("error_message", None)
+                sent += 1
+            socketio.emit('game_over', {}, room=spectator_room(game))
+            close_tournament_table(room_id, game)
         game.info_message = None
+        broadcast_emits.observe(sent)
+        broadcast_seconds.observe(time.perf_counter() - started)
+        schedule_bot_turn(game)
+
+    def flush_broadcasts_periodically():
+        # 한 번의 패스에서 모든 방의 대기 중인 broadcast 를 각 방의 큐에 올린다
+        while True:
+            socketio.sleep(broadcast_tick)
+            for room_id in list(pending_broadcasts):
+                if room_id not in flushes_queued:     # 큐가 밀려 있어도 방마다 flush 는 하나만
+                    flushes_queued.add(room_id)
+                    commands.post(room_id, functools.partial(flush_game_state, room_id))
+
+    if broadcast_tick:
+        socketio.start_background_task(flush_broadcasts_periodically)
+
+    # --- 봇 차례 처리 ----------------------------------------------
+    bot_turns_running = set()   # room_id – 방마다 봇 작업은 하나만
+
+    def schedule_bot_turn(game):
+        cur_round = game.current_round
+        if game.game_over or cur_round is None or game.room_id in bot_turns_running:
+            return
+        bot = cur_round.players[cur_round.current_turn_index]
+        if bot.is_bot:
+            bot_turns_running.add(game.room_id)
+            socketio.start_background_task(run_bot_turn, game, bot)
+
+    def run_bot_turn(game, bot):
+        """Let ``bot`` play its turn; the search runs in the bot worker pool.
+
+        Only the move itself goes through the room's command queue, so other
+        commands for the room keep running while the bot thinks.
+        """
+        action = None
+        try:
+            if bots.needs_search(game, bot):
+                future = bots.submit_search(game, bot, app.config.get("BOT_MOVE_BUDGET", 0.5))
+                while not future.done():
+                    socketio.sleep(0.02)
+                action = future.result()
+        except Exception:
+            # 탐색 실패 → 휴리스틱으로 두어 봇 자리에서 게임이 멈추지 않게 한다
+            socketio.server.logger.exception("bot search failed in room %s", game.room_id)
+            action = None
+
+        def play():
+            try:
+                cur_round = game.current_round
+                # 생각하는 동안 게임이 바뀌었으면 (이탈, 중단 등) 포기
+                # 탐색 중 사람이 자리를 되찾았으면 (reclaim_from_bot) 봇의 수를 두지 않는다
+                if games.get(game.room_id) is not game or cur_round is None or not bot.is_bot \
+                        or cur_round.players[cur_round.current_turn_index] is not bot:
+                    return
+                if action is None:
+                    bots.play_heuristic(game, bot)
+                else:
+                    _, events = engine.apply(game, bot, action)
+                    if events[0]["type"] == "error":
+                        engine.apply(game, bot, engine.Fold())
+                if game.current_round is None and not game.game_over:
+                    game.start_round()
+            finally:
+                bot_turns_running.discard(game.room_id)
+            broadcast_game_state(game)
+
+        commands.submit(game.room_id, play)
+
+    def release_room_queue(room_id):
+        """Stop the room's command worker once the room is gone entirely."""
+        if room_id and room_id not in games and room_id not in waiting_rooms:
+            close_tournament_table(room_id)
+            pending_broadcasts.pop(room_id, None)
+            watchers.pop(room_id, None)
+            spectator_views.pop(room_id, None)
+            commands.close(room_id)
+
+    # --- TTL 만료 방 정리 ----------------------------------------
+    def evict_room(room_id, reason):
+        """Runs on the room's command queue: notify, close socket rooms, drop the room."""
+        if room_id in tournament_held or not sweeper.expired(room_id):
+            return                      # 큐에서 기다리는 동안 활동이 있었음 / 다음 배정 대기 중
+        socketio.emit("room_closed", {"room": room_id, "reason": reason}, room=room_id)
+        game = games.get(room_id)
+        if game:
+            for p in game.players:
+                socketio.close_room(player_room(game, p))
+            socketio.close_room(spectator_room(game))
+        socketio.close_room(room_id)
+        sweeper.evict(room_id, reason)
+        pending_broadcasts.pop(room_id, None)
+        watchers.pop(room_id, None)
+        spectator_views.pop(room_id, None)
+        close_tournament_table(room_id, game)
+        publish_room_listing(room_id)
+        bot_turns_running.discard(room_id)
+        commands.close(room_id)
+
+    def sweep_periodically():
+        while True:
+            socketio.sleep(app.config.get("ROOM_SWEEP_INTERVAL", 30.0))
+            session_data.expire()
+            for room_id, reason in sweeper.candidates():
+                commands.submit(room_id, functools.partial(evict_room, room_id, reason))
+            # 방이 사라진 뒤에도 남은 큐 정리 (토너먼트 큐는 토너먼트가 끝날 때 닫힌다)
+            for room_id in list(commands.actors):
+                if not room_id.startswith("tournament:"):
+                    release_room_queue(room_id)
+
+    socketio.start_background_task(sweep_periodically)
+
+    def start_game_if_full(room_id):
+        """Create the Game once the waiting room has all its seats filled."""
+        wr = waiting_rooms.get(room_id)
+        if not wr or len(wr['joiners']) < wr['config'].player_count:
+            return None
+        g = Game(wr['config'], room_id)
+        for n in wr['joiners']:
+            g.add_player(Player(n, is_bot=n in wr.get('bots', ())))
+        games[room_id] = g
+        waiting_rooms.pop(room_id, None)
+        return g
+
+    # --- 토너먼트: 테이블마다 방 하나, 모든 테이블이 끝나면 다음 라운드 ---
+    # 대진표 갱신은 토너먼트 전용 큐("tournament:<id>")에서 직렬화한다.
+    tournament_rooms = {}       # room_id -> (tournament_id, table_id)
+    # 끝난 테이블의 방은 라운드가 넘어가 tournament_next 를 보낼 때까지 TTL 정리에서 뺀다
+    tournament_held = set()
+
+    def tournament_queue(tournament_id):
+        return f"tournament:{tournament_id}"
+
+    def open_tournament_round(t):
+        """A private waiting room per table of the current round; returns {name: room_id}."""
+        assignments = {}
+        for table in t.tables:
+            room_id = shard.new_room_id()
+            bot_names = t.fill_bots(table)
+            waiting_rooms[room_id] = {
+                'config': t.cfg,
+                'joiners': list(bot_names),
+                'bots': set(bot_names),
+                'seats': table['seats'],      # 배정된 참가자만 입장 가능
+            }
+            table['room_id'] = room_id
+            tournament_rooms[room_id] = (t.id, table['id'])
+            sweeper.touch(room_id)
+            assignments.update(dict.fromkeys(table['seats'], room_id))
+        return assignments
+
+    def tournament_seats(room_id):
+        """Entrants assigned to the tournament table in ``room_id`` (None for other rooms)."""
+        entry = tournament_rooms.get(room_id)
+        t = tournaments.get(entry[0]) if entry else None
+        table = t.table(entry[1]) if t else None
+        return table['seats'] if table else None
+
+    def close_tournament_table(room_id, game=None):
+        """Runs on the room's queue when its game ends or the room is evicted."""
+        entry = tournament_rooms.pop(room_id, None)
+        if entry:
+            if game is not None and game.game_over:
+                tournament_held.add(room_id)
+            rows = standings(game) if game else []
+            commands.post(tournament_queue(entry[0]),
+                          functools.partial(record_tournament_table, entry[0], entry[1], rows))
+
+    def record_tournament_table(tournament_id, table_id, rows):
+        t = tournaments.get(tournament_id)
+        if t is None:
+            return
+        tournament_tables.inc()
+        finished_rooms = [table['room_id'] for table in t.tables]
+        if not t.record(table_id, rows):
+            return
+        if t.finished:
+            event = {"tournament": t.id, "champion": t.champion}
+            commands.close(tournament_queue(t.id))
+        else:
+            event = {"tournament": t.id, "tables": open_tournament_round(t)}
+        # 끝난 테이블의 room 채널로 다음 테이블 배정 (클라이언트는 자기 이름만 본다)
+        for rid in finished_rooms:
+            socketio.emit('tournament_next', event, room=rid)
+            tournament_held.discard(rid)
+            sweeper.touch(rid)          # 이제부터 보통의 finished TTL
+
+    @app.route('/tournament', methods=['POST'])
+    def create_tournament():
+        """Seat ``entrants`` (comma or newline separated) across tables; returns the bracket."""
+        names = [n.strip() for n in request.form.get('entrants', '').replace('\n', ',').split(',') if n.strip()]
+        try:
+            cfg = dataclasses.replace(config_from_form(request.form), private=True)
+            t = Tournament(cfg, names, request.form.get('advance', 1, type=int),
+                           tournament_id=shard.new_room_id())
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        tournaments[t.id] = t
+        open_tournament_round(t)
+        return jsonify(t.summary()), 201
+
+    @app.route('/tournament/<tournament_id>')
+    def tournament_status(tournament_id):
+        t = tournaments.get(tournament_id)
+        if t is None:
+            return jsonify({"error": "토너먼트를 찾을 수 없습니다."}), 404
+        if t.finished:
+            return jsonify(t.summary())
+        return jsonify(commands.submit(tournament_queue(t.id), t.summary))
 
     # --- 실시간 로비 인원 목록 브로드캐스트 ------------------------
     def broadcast_lobby_state(room_id):
         if room_id in waiting_rooms:
             info = waiting_rooms[room_id]
+            waiting_rooms.mark_dirty(room_id)
             socketio.emit(
                 "lobby_update",
                 {
@@ -144,25 +682,40 @@ def register_routes(app, socketio):
         """Emit lobby_restart so all game clients redirect to lobby page."""
         socketio.emit("lobby_restart", {"room": room_id}, room=room_id)
 
+    def config_from_form(form):
+        """GameConfig from the create form; ValueError if a value is missing or out of range."""
+        try:
+            cfg = GameConfig(
+                title       = form.get('title') or "Trump OUT Room",
+                private     = bool(form.get('private')),
+                player_count= int(form.get('player_count', 4)),
+                hand_count  = int(form.get('hand_count', 6)),
+                mulligan_count = int(form.get('mulligan_count', 4)),
+                max_cards_per_play = int(form.get('max_cards_per_play', 2)),
+                first_player_threshold = int(form.get('first_player_threshold', 5)),
+                bot_fill    = bool(form.get('bot_fill'))
+            )
+        except ValueError:
+            raise ValueError("방 설정 값은 숫자여야 합니다.") from None
+        return check_config(cfg)
+
     @app.route('/create', methods=['POST'])
     def create():
         # This route only handles POST submissions from the inline create panel.
-        cfg = GameConfig(
-            title       = request.form.get('title') or "Trump OUT Room",
-            private     = bool(request.form.get('private')),
-            player_count= int(request.form.get('player_count', 4)),
-            hand_count  = int(request.form.get('hand_count', 6)),
-            mulligan_count = int(request.form.get('mulligan_count', 4)),
-            max_cards_per_play = int(request.form.get('max_cards_per_play', 2)),
-            first_player_threshold = int(request.form.get('first_player_threshold', 5))
-        )
-        room_id = secrets.token_hex(3)
+        try:
+            cfg = config_from_form(request.form)
+        except ValueError as exc:
+            return error_response(str(exc))
+        room_id = shard.new_room_id()
         waiting_rooms[room_id] = {
             'config': cfg,
-            'joiners': [request.form.get('host_name')]
+            'joiners': [request.form.get('host_name')],
+            'bots': set()
         }
         session['player_name'] = request.form.get('host_name')
         session['room_id']     = room_id
+        sweeper.touch(room_id)
+        publish_room_listing(room_id)
         broadcast_lobby_state(room_id)
         return redirect(url_for('lobby', room_id=room_id))
 
@@ -170,6 +723,9 @@ def register_routes(app, socketio):
     def lobby(room_id):
         wr = waiting_rooms.get(room_id)
         if not wr:
+            # 이미 시작된 게임의 링크 → 참가자가 아니면 관전 화면으로
+            if room_id in games and session.get('room_id') != room_id:
+                return redirect(url_for('watch', room_id=room_id))
             return error_response("방을 찾을 수 없습니다.")
         return render_template(
             "lobby.html",
@@ -180,13 +736,39 @@ def register_routes(app, socketio):
             left_message = wr.get('last_left')
         )
 
+    @app.route('/lobby/<room_id>/add_bot', methods=['POST'])
+    @room_command
+    def add_bot(room_id):
+        wr = waiting_rooms.get(room_id)
+        if not wr:
+            return error_response("방을 찾을 수 없습니다.")
+        if session.get('room_id') != room_id or session.get('player_name') not in wr['joiners']:
+            return error_response("방에 참가한 플레이어만 봇을 추가할 수 있습니다.")
+        if len(wr['joiners']) < wr['config'].player_count:
+            name = bots.bot_name(wr['joiners'])
+            wr['joiners'].append(name)
+            wr.setdefault('bots', set()).add(name)
+            broadcast_lobby_state(room_id)
+            if start_game_if_full(room_id):
+                socketio.emit("lobby_start", {"room": room_id}, room=room_id)
+                return redirect(url_for('index'))
+        return redirect(url_for('lobby', room_id=room_id))
+
     @app.route('/rooms')
     def rooms():
-        public_rooms = {rid:info for rid,info in waiting_rooms.items()
-                        if not info['config'].private}
-        return render_template('rooms.html', rooms=public_rooms)
+        page, next_cursor = room_index.page(limit=ROOM_PAGE_SIZE)
+        return render_template('rooms.html', rooms=page, next_cursor=next_cursor)
+
+    @app.route('/rooms/list')
+    def room_list():
+        """JSON page of public rooms; ``after`` is the ``next`` cursor of the previous page."""
+        after = request.args.get('after', 0, type=int)
+        limit = max(1, min(request.args.get('limit', ROOM_PAGE_SIZE, type=int), 100))
+        page, next_cursor = room_index.page(after, limit)
+        return jsonify({"rooms": page, "next": next_cursor, "total": len(room_index)})
 
     @app.route('/join/<room_id>', methods=['GET', 'POST'])
+    @room_command
     def join(room_id):
         wr_game = games.get(room_id)
         wr_wait = waiting_rooms.get(room_id)
@@ -199,17 +781,18 @@ def register_routes(app, socketio):
                 return error_response("이름을 입력하세요.")
             if wr_game:
                 # Ongoing game: only allow if name exists in players
-                if not any(p.name == name for p in wr_game.players):
+                seat = wr_game.get_player(name)
+                if not seat:
                     return error_response("진행중인 게임에 참가할 수 없습니다.")
+                wr_game.reclaim_from_bot(name)   # 봇이 대신하던 자리라면 되찾기
             elif wr_wait:
+                if name in wr_wait.get('bots', ()):
+                    return error_response("이미 사용 중인 닉네임입니다.")
+                if 'seats' in wr_wait and name not in wr_wait['seats']:
+                    return error_response("이 테이블에 배정된 참가자가 아닙니다.")
                 if name not in wr_wait['joiners']:
                     wr_wait['joiners'].append(name)
-                if len(wr_wait['joiners']) == wr_wait['config'].player_count:
-                    g = Game(wr_wait['config'], room_id)
-                    for n in wr_wait['joiners']:
-                        g.add_player(Player(n))
-                    games[room_id] = g
-                    waiting_rooms.pop(room_id, None)
+                start_game_if_full(room_id)
             else:
                 return error_response("잘못된 방입니다.")
             session['player_name'] = name
@@ -223,6 +806,7 @@ def register_routes(app, socketio):
         return redirect(url_for('lobby', room_id=room_id))
 
     @app.route('/')
+    @room_command
     def index():
         # 0) 아직 어떤 방도 선택하지 않은 사용자는 공개 로비로 이동
         if 'room_id' not in session:
@@ -251,7 +835,7 @@ def register_routes(app, socketio):
                                 game_over=True,
                                 final_scores=final_scores,
                                 player_name=player_name,
-                                pending_j=session.get("pending_j", False))
+                                pending_j=False)
         if len(game.players) < game.cfg.player_count:
             state = {"message": "아직 플레이어가 모이지 않았습니다.",
                     "players": [p.name for p in game.players]}
@@ -259,142 +843,86 @@ def register_routes(app, socketio):
         if game.current_round is None:
             game.start_round()
             broadcast_game_state(game)
-        return render_template("main.html", player_name=player_name, game_over=False, pending_j=session.get("pending_j", False))
+        player_obj = game.get_player(player_name)
+        pending_j = bool(player_obj and game.j_pending.get(player_obj.id))
+        return render_template("main.html", player_name=player_name, game_over=False, pending_j=pending_j)
+
+    @app.route('/watch/<room_id>')
+    @room_command
+    def watch(room_id):
+        """Spectator page: public view only, no seat and no hand."""
+        game = games.get(room_id)
+        if not game:
+            return error_response("관전할 수 있는 진행 중인 게임이 없습니다.")
+        if game.game_over:
+            final_scores = {p.name: p.total_points for p in game.players}
+            return render_template("main.html", spectator=True, watch_room=room_id, game_over=True,
+                                   final_scores=final_scores, player_name=None, pending_j=False)
+        return render_template("main.html", spectator=True, watch_room=room_id, game_over=False,
+                               player_name=None, pending_j=False)
+
+    def perform_action(game, player, action_type, values):
+        """Parse and apply one action, then push the new state; returns the error (or None)."""
+        action, error = engine.parse_action(action_type, values)
+        if not error:
+            game, events = engine.apply(game, player, action)
+            error = next((e["message"] for e in events if e["type"] == "error"), None)
+        if error:
+            flash_error(error)
+        if game.current_round is None and not game.game_over:
+            game.start_round()     # 라운드 종료 → 페이지 새로고침 없이 다음 라운드 시작
+        broadcast_game_state(game)
+        return error
 
     @app.route('/action', methods=['POST'])
+    @room_command
     def action():
+        """Form fallback for the socket ``action`` event."""
         if 'player_name' not in session:
             return redirect(url_for('join', room_id=session.get('room_id')))
         game = current_game()
-        if not game:
+        if not game or game.current_round is None:
             return redirect(url_for('index'))
-        player_name = session['player_name']
-        player = next((p for p in game.players if p.name == player_name), None)
-        if game.current_round is None:
-            return redirect(url_for('index'))
-        cur_round = game.current_round
-        current_turn = cur_round.players[cur_round.current_turn_index].name
-        if player.name != current_turn:
-            flash_error("아직 당신의 차례가 아닙니다.")
-            broadcast_game_state(game)
-            return ('', 204)
-        
-        action_type = request.form.get("action_type")
-        if action_type == "raise":
-            indices = request.form.getlist("card_indices")
-            try:
-                indices = [int(x) for x in indices]
-            except ValueError:
-                flash_error("유효한 카드 인덱스가 아닙니다.")
-                broadcast_game_state(game)
-                return ('', 204)
-            success, message = cur_round.player_raise(player, indices)
-            if not success:
-                flash_error(message)
-                broadcast_game_state(game)
-                return ('', 204)
-            if cur_round.bet_history[-1][3] == "J":
-                # J 효과 대기 상태 등록
-                game.j_pending[player.id] = True
-                broadcast_game_state(game)
-                return ('', 204)
-        elif action_type == "fold":
-            # If eligible for mulligan
-            if not player.has_raised and not player.mulligan_used:
-                new_cards = game.deck.draw(game.cfg.mulligan_count)
-                player.hand.extend(new_cards)
-                game.mulligan_info[player.id] = {
-                    'pending': True,
-                    'cards': [str(app.jinja_env.globals['card_to_html'](c)) for c in new_cards]
-                }
-                broadcast_game_state(game)
-                return ('', 204)   # no full-page reload; updates via SocketIO
-            # Otherwise perform fold
-            success, message = cur_round.player_fold(player)
-            if not success:
-                flash_error(message)
-                broadcast_game_state(game)
-                return ('', 204)
-        elif action_type == 'mulligan_discard':
-            indices = request.form.getlist('discard_indices')
-            indices = sorted([int(x) for x in indices], reverse=True)
-            if len(indices) != game.cfg.mulligan_count:
-                flash_error(f"{game.cfg.mulligan_count}장을 정확히 선택해야 합니다.")
-                broadcast_game_state(game)
-                return ('', 204)
-            for idx in indices:
-                try:
-                    player.hand.pop(idx)
-                except IndexError:
-                    flash_error("잘못된 카드 인덱스입니다.")
-                    broadcast_game_state(game)
-                    return ('', 204)
-            player.mulligan_used = True
-            player.last_action = "멀리건"
-            game.mulligan_info.pop(player.id, None)   # clear
-            success, message = cur_round.player_fold(player)
-            if not success:
-                flash_error(message)
-                broadcast_game_state(game)
-                return ('', 204)
-            
-        elif action_type == 'j_select':
-            target = request.form.get('target')
-            if not target:
-                flash_error("유효한 대상을 선택해주세요.")
-                broadcast_game_state(game)
-                return ('', 204)
-            # store hand HTML for selected target
-            target_player = next(p for p in game.players if p.name == target)
-            session['j_target'] = target
-            session['j_target_hand'] = [str(app.jinja_env.globals['card_to_html'](c)) for c in target_player.hand]
-            broadcast_game_state(game)
-            return ('', 204)
-
-        elif action_type == 'j_discard':
-            indices = request.form.getlist('discard_indices')
-            indices = [int(x) for x in indices]
-            target_name = session.pop('j_target')
-            target_player = next(p for p in game.players if p.name == target_name)
-            for idx in sorted(indices, reverse=True):
-                card_html = str(app.jinja_env.globals['card_to_html'](target_player.hand[idx]))
-                target_player.hand.pop(idx)
-            session.pop('j_target_hand', None)
-            game.j_pending.pop(player.id, None)
-            # broadcast info message to everyone
-            game.info_message = f"{player_name} ▶ {target_name} 의 {card_html} 를 버렸습니다."
-        else:
-            flash_error("알 수 없는 행동입니다.")
-            broadcast_game_state(game)
-            return ('', 204)
-        if cur_round.check_round_over():
-            game.end_round()
-        else:
-            cur_round.next_player()
-        broadcast_game_state(game)
-        return redirect(url_for('index'))
+        player = game.get_player(session['player_name'])
+        perform_action(game, player, request.form.get("action_type"), request.form.getlist)
+        return ('', 204)   # updates arrive via SocketIO
 
     @app.route('/logout')
+    @room_command
     def logout():
         rid  = session.get('room_id')
         name = session.get('player_name')
+        session_data.discard(session.get('sid'))
         session.clear()
 
         # ── 진행 중 게임에서 이탈 ──────────────────────────────
         if rid and rid in games:
             game = games[rid]
+            humans_left = any(not p.is_bot and p.name != name for p in game.players)
+            if game.cfg.bot_fill and humans_left and not game.game_over:
+                # 나간 자리를 봇이 이어받아 게임 계속
+                game.replace_with_bot(name)
+                broadcast_game_state(game)
+                return redirect(url_for('rooms'))
             aborted = game.remove_player(name)     # returns True if players < min
             if aborted:
+                # 토너먼트 테이블이면 남은 인원 기준으로 바로 대진표에 기록
+                seats = tournament_seats(rid)
+                close_tournament_table(rid, game)
                 # Move remaining players to waiting room
                 waiting_rooms[rid] = {
                     'config': game.cfg,
-                    'joiners': [p.name for p in game.players]
+                    'joiners': [p.name for p in game.players],
+                    'bots': {p.name for p in game.players if p.is_bot}
                 }
+                if seats is not None:
+                    waiting_rooms[rid]['seats'] = seats
                 games.pop(rid, None)
                 broadcast_lobby_state(rid)
                 broadcast_lobby_restart(rid)
-                # If no players remain in waiting room, delete it
-                if rid in waiting_rooms and len(waiting_rooms[rid]['joiners']) == 0:
+                # If no human players remain in waiting room, delete it
+                wr = waiting_rooms.get(rid)
+                if wr and all(n in wr['bots'] for n in wr['joiners']):
                     waiting_rooms.pop(rid, None)
             else:
                 broadcast_game_state(game)
@@ -405,35 +933,175 @@ def register_routes(app, socketio):
             if name in wr['joiners']:
                 wr['joiners'].remove(name)
                 broadcast_lobby_state(rid)
-                if len(wr['joiners']) == 0:
+                if all(n in wr.get('bots', ()) for n in wr['joiners']):
                     waiting_rooms.pop(rid, None)
 
+        release_room_queue(rid)
         return redirect(url_for('rooms'))
 
     @app.route('/reset')
+    @room_command
     def reset():
         rid = session.get('room_id')
         if rid and rid in games:
             games.pop(rid)
         if rid and rid in waiting_rooms:
             waiting_rooms.pop(rid)
+        session_data.discard(session.get('sid'))
         session.clear()
+        release_room_queue(rid)
         # No game here to broadcast; skip broadcast_game_state
         return redirect(url_for('join', room_id=rid) if rid else url_for('rooms'))
 
-    @socketio.on('connect')
-    def handle_connect():
-        player_name = session.get('player_name')
-        if player_name:
-            g = current_game()
-            if g:
-                player_obj = next((pl for pl in g.players if pl.name == player_name), None)
-                if player_obj:
-                    join_room(player_room(g, player_obj))
-                    # Join the room‑wide channel as well for lobby events
-                    join_room(g.room_id)
-                    emit('game_state_update', get_state_for(g, player_name), room=player_room(g, player_obj))
-
-    @socketio.on("join_lobby")
+    @app.route('/cards.json')
+    def cards():
+        """Card id -> label / color / tooltip. The URL is versioned, so clients cache it for good."""
+        resp = Response(card_table_json, mimetype="application/json")
+        resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        resp.set_etag(card_table_version)
+        return resp.make_conditional(request)
+
+    @app.route('/metrics')
+    def metrics_text():
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    @app.route('/debug/replay/<room_id>')
+    @room_command
+    def replay_dump(room_id):
+        """Seed + action log of a running game, for ``python replay.py``."""
+        game = games.get(room_id)
+        if not game:
+            return error_response("방을 찾을 수 없습니다.")
+        resp = Response(export_game(game), mimetype="application/octet-stream")
+        resp.headers["Content-Disposition"] = f"attachment; filename=replay-{room_id}.bin"
+        return resp
+
+    @app.route('/stats/<room_id>')
+    @room_command
+    def room_statistics(room_id):
+        """Running per-player / per-room statistics (no history scan)."""
+        game = games.get(room_id)
+        if not game:
+            return jsonify({"error": "방을 찾을 수 없습니다."}), 404
+        return jsonify(game.stats.summary(game))
+
+    @app.route('/debug/queues')
+    def queue_stats():
+        """Per-room command queue depth and wait times."""
+        return jsonify(commands.stats())
+
+    @app.route('/debug/rooms')
+    def room_stats():
+        """Room count, sweeps and TTL evictions so far."""
+        return jsonify(sweeper.stats())
+
+    @on_event('connect')
+    def handle_connect(auth=None):
+        watch_room = auth.get('watch') if isinstance(auth, dict) else None
+        version = auth.get('version') if isinstance(auth, dict) else None
+        if watch_room:
+            return connect_spectator(version, room_id=watch_room)
+        return connect_player(version)
+
+    @room_command
+    def connect_spectator(version, room_id):
+        game = games.get(room_id)
+        if not game:
+            return False
+        # 소켓 세션에만 적용된다 – 쿠키의 좌석 정보는 그대로
+        session['room_id'] = room_id
+        session['watching'] = True
+        session.pop('player_name', None)
+        watchers.setdefault(room_id, set()).add(request.sid)
+        join_room(spectator_room(game))
+        join_room(room_id)      # room_closed / lobby_restart
+        view = spectator_state(game)
+        if version != view["version"]:
+            socketio.emit('game_state_update', view, to=request.sid)
+
+    @room_command
+    def connect_player(version=None):
+        """Join the player's rooms; ``version`` is the last state the client holds (None = none)."""
+        g = current_game()
+        player_obj = session_player(g)
+        if player_obj:
+            join_room(player_room(g, player_obj))
+            # Join the room‑wide channel as well for lobby events
+            join_room(g.room_id)
+            session['player_id'] = player_obj.id      # disconnect 에서 사용 (소켓 세션만)
+            key = (g.room_id, player_obj.id)
+            online_players[key] = online_players.get(key, 0) + 1
+            reconnects.inc(resume_player(g, player_obj, version))
+
+    # --- delta update 확인 / 재동기화 ------------------------------
+    def session_player(game):
+        return game.get_player(session.get('player_name')) if game else None
+
+    @on_event('state_ack')
+    @room_command
+    def handle_state_ack(data):
+        g = current_game()
+        player_obj = session_player(g)
+        if not player_obj or player_obj.id not in g.client_views:
+            return
+        view = g.client_views[player_obj.id]
+        try:
+            version = int((data or {}).get('version', 0))
+        except (TypeError, ValueError):
+            return
+        if view["acked"] < version <= view["version"]:
+            view["acked"] = version
+
+    @on_event('state_resync')
+    @room_command
+    def handle_state_resync(data=None):
+        """Client detected a version gap → send a full snapshot."""
+        g = current_game()
+        if g and session.get('watching'):
+            socketio.emit('game_state_update', spectator_state(g), to=request.sid)
+            return
+        player_obj = session_player(g)
+        if player_obj:
+            request_resync(g, player_obj)
+
+    @on_event('action')
+    @room_command
+    def handle_action(data):
+        """Apply a raise / fold / mulligan / J action; the ack carries the result."""
+        g = current_game()
+        if session.get('watching'):
+            return {"ok": False, "error": "관전 중에는 행동할 수 없습니다."}
+        player_obj = session_player(g)
+        if not player_obj or g.current_round is None:
+            return {"ok": False, "error": "진행 중인 게임이 없습니다."}
+        data = data or {}
+        error = perform_action(g, player_obj, data.get("action_type"), engine.payload_values(data))
+        # 병합 대기 중인 push 가 있으면 그 flush 가 버전을 하나 올린다 (같은 방 큐라 그 사이 다른 변경 없음)
+        version = g.version + (g.room_id in pending_broadcasts)
+        return {"ok": error is None, "error": error, "version": version}
+
+    @on_event('disconnect')
+    def handle_disconnect(reason=None):
+        if session.get('watching'):
+            watchers.get(session.get('room_id'), set()).discard(request.sid)
+        elif 'player_id' in session:
+            key = (session.get('room_id'), session['player_id'])
+            if key[0] in games:
+                # connect_player 와 같은 방 큐에서 세어야 접속 수가 어긋나지 않는다
+                commands.post(key[0], functools.partial(player_offline, key))
+            else:
+                online_players.pop(key, None)
+
+    def player_offline(key):
+        if online_players.get(key, 0) > 1:
+            online_players[key] -= 1
+        else:
+            online_players.pop(key, None)
+
+    @on_event("join_room_list")
+    def handle_join_room_list(data=None):
+        join_room(ROOM_LIST_CHANNEL)
+
+    @on_event("join_lobby")
     def handle_join_lobby(data):
         join_room(data.get("room"))
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Server-side store for per-player transient state.
+
+The signed Flask cookie only carries identity: ``sid``, ``player_name`` and
+``room_id``. Anything short-lived, such as one-shot error flashes, lives
+here, keyed by ``sid``, and expires after ``ttl`` seconds without access.
+Socket.IO handlers get a copy of the cookie session at connect, so they see
+the same ``sid`` and share the entry with HTTP requests.
+"""
+import secrets
+import threading
+import time
+
+class SessionStore:
+    def __init__(self, ttl=3600.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._data: dict[str, tuple[float, dict]] = {}   # sid -> (last access, values)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id():
+        return secrets.token_urlsafe(9)
+
+    def _values(self, sid, create):
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                if not create:
+                    return None
+                entry = self._data[sid] = (self.clock(), {})
+            else:
+                self._data[sid] = (self.clock(), entry[1])
+            return entry[1]
+
+    def get(self, sid, key, default=None):
+        values = self._values(sid, create=False) if sid else None
+        return values.get(key, default) if values else default
+
+    def set(self, sid, key, value):
+        if sid:
+            self._values(sid, create=True)[key] = value
+
+    def pop(self, sid, key, default=None):
+        values = self._values(sid, create=False) if sid else None
+        return values.pop(key, default) if values else default
+
+    def discard(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def expire(self):
+        """Drop sessions idle for longer than ``ttl``; returns how many were dropped."""
+        cutoff = self.clock() - self.ttl
+        with self._lock:
+            stale = [sid for sid, (seen, _) in self._data.items() if seen < cutoff]
+            for sid in stale:
+                del self._data[sid]
+        return len(stale)
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,193 @@
+"""Room-sharded multi-process deployment.
+
+Each worker process owns a deterministic shard of room ids, chosen by
+consistent hashing. Requests for a room owned by another shard are
+redirected to that shard's base URL, so the page and its socket both land
+on the owner. Emits that must reach every shard go through a Socket.IO
+message queue. This is either a standard python-socketio backend URL
+(``redis://...``, ``amqp://...``) or ``local:///some/dir``, a unix
+datagram stand-in for single-machine deployments.
+
+Worker settings (environment):
+
+* ``SHARD_INDEX`` / ``SHARD_URLS`` – this worker's index and the
+  comma-separated base URLs of all workers, in shard order
+* ``MESSAGE_QUEUE`` – message queue URL shared by all workers
+
+``python shard.py 4`` starts four local workers on consecutive ports.
+"""
+import bisect
+import errno
+import hashlib
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import socketio
+
+# ── consistent hashing ──────────────────────────────
+
+def _hash(key):
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+class HashRing:
+    """Consistent-hash ring mapping room ids to shard indexes."""
+
+    def __init__(self, shard_count, vnodes=64):
+        self.shard_count = shard_count
+        points = sorted((_hash(f"shard-{s}-{v}"), s) for s in range(shard_count) for v in range(vnodes))
+        self._keys = [h for h, _ in points]
+        self._shards = [s for _, s in points]
+
+    def shard_for(self, room_id):
+        i = bisect.bisect(self._keys, _hash(room_id)) % len(self._keys)
+        return self._shards[i]
+
+class ShardConfig:
+    """This worker's place in the shard ring."""
+
+    def __init__(self, index=0, urls=()):
+        self.index = index
+        self.urls = list(urls) or [""]
+        self.ring = HashRing(len(self.urls))
+
+    @classmethod
+    def from_env(cls):
+        urls = [u.rstrip("/") for u in os.getenv("SHARD_URLS", "").split(",") if u]
+        return cls(int(os.getenv("SHARD_INDEX", 0)), urls)
+
+    @property
+    def sharded(self):
+        return len(self.urls) > 1
+
+    def owns(self, room_id):
+        return not self.sharded or self.ring.shard_for(room_id) == self.index
+
+    def owner_url(self, room_id):
+        return self.urls[self.ring.shard_for(room_id)]
+
+    def new_room_id(self):
+        """A fresh room id (secrets.token_hex(3)) that hashes to this shard."""
+        while True:
+            room_id = secrets.token_hex(3)
+            if self.owns(room_id):
+                return room_id
+
+# ── local message queue stand-in ────────────────────
+
+class LocalQueueManager(socketio.PubSubManager):
+    """Pub/sub over unix datagram sockets in a shared directory.
+
+    Every worker binds ``<dir>/<host_id>.sock``; publishing sends the
+    message to every socket in the directory. A full receive buffer is
+    retried a few times with a short backoff. Messages that still cannot
+    be delivered, or that exceed the datagram size limit, are logged and
+    counted in ``dropped``. A worker that stays full gets no retries
+    until it reads again, so one stuck worker cannot slow every emit.
+    """
+    name = "local"
+    send_retries = 5
+    retry_delay = 0.002         # 초, 재시도마다 두 배
+
+    def __init__(self, url="local:///tmp/trumpout-mq", channel="socketio", write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.directory = os.path.join(urlparse(url).path or "/tmp/trumpout-mq", channel)
+        os.makedirs(self.directory, exist_ok=True)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.path = None
+        self.dropped = {"full": 0, "oversize": 0}
+        self._stalled = set()       # 버퍼가 찬 채로 남아 있는 소켓 경로
+        if not write_only:
+            self.path = os.path.join(self.directory, f"{self.host_id}.sock")
+            self.sock.bind(self.path)
+
+    def _publish(self, data):
+        payload = self.json.dumps(data).encode()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".sock") or path == self.path:
+                continue
+            self._send(payload, path)
+
+    def _send(self, payload, path):
+        retries = 0 if path in self._stalled else self.send_retries
+        for attempt in range(retries + 1):
+            try:
+                self.sock.sendto(payload, path)
+                self._stalled.discard(path)
+                return
+            except (ConnectionRefusedError, FileNotFoundError):
+                # 종료된 워커의 소켓 파일 정리
+                self._stalled.discard(path)
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                return
+            except BlockingIOError:
+                # 받는 워커의 버퍼가 가득 참 → 잠깐 기다렸다 다시 보낸다
+                if attempt < retries:
+                    self._sleep(self.retry_delay * 2 ** attempt)
+            except OSError as exc:
+                if exc.errno != errno.EMSGSIZE:
+                    raise
+                self.dropped["oversize"] += 1
+                self._get_logger().error("local mq: %d byte message exceeds the datagram limit, "
+                                         "not delivered to %s", len(payload), path)
+                return
+        self.dropped["full"] += 1
+        if path not in self._stalled:
+            self._stalled.add(path)
+            self._get_logger().warning("local mq: %s is not reading, dropping messages", path)
+
+    def _sleep(self, seconds):
+        if self.server is not None:
+            self.server.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _listen(self):
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(1 << 20)
+            except BlockingIOError:
+                self.server.sleep(0.005)
+                continue
+            yield data
+
+def client_manager(url):
+    """Socket.IO client manager for a MESSAGE_QUEUE url (None if unset)."""
+    if not url:
+        return None
+    if url.startswith("local:"):
+        return LocalQueueManager(url)
+    if url.startswith(("redis://", "rediss://")):
+        return socketio.RedisManager(url)
+    return socketio.KombuManager(url)
+
+# ── local launcher ──────────────────────────────────
+
+def launch(workers, base_port=5000, queue="local:///tmp/trumpout-mq"):
+    """Start ``workers`` app processes on consecutive ports; returns the Popen list."""
+    urls = ",".join(f"http://127.0.0.1:{base_port + i}" for i in range(workers))
+    procs = []
+    for i in range(workers):
+        env = dict(os.environ, SHARD_INDEX=str(i), SHARD_URLS=urls,
+                   MESSAGE_QUEUE=queue, PORT=str(base_port + i))
+        procs.append(subprocess.Popen([sys.executable, "app.py"], env=env,
+                                      cwd=os.path.dirname(os.path.abspath(__file__))))
+    return procs
+
+if __name__ == "__main__":
+    procs = launch(int(sys.argv[1]) if len(sys.argv) > 1 else 2)
+    try:
+        for p in procs:
+            p.wait()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
@@ -0,0 +1,232 @@
+"""Batch Monte Carlo simulator for GameConfig balance tuning.
+
+Plays many games with scripted policies across a process pool and reports
+per-config statistics: score distribution, first-player advantage, round
+length and deck-refresh frequency. Games are driven through
+``engine.apply`` so the simulator always uses the real ``Deck`` /
+``Round.player_raise`` / ``Round.finish_round`` rules.
+
+Usage (from the ``game`` directory)::
+
+    python simulate.py --games 10000 --hand-count 5,6,7 --mulligan-count 3,4
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import engine
+from models import CARDS, Game, GameConfig, Player
+
+# ── scripted policies ───────────────────────────────
+# policy(game, player, rng) -> engine action
+
+def _numeric_indices(hand):
+    return [i for i, c in enumerate(hand) if not c.is_special()]
+
+def greedy_policy(game, player, rng):
+    """Play the single numeric card that beats the current bet by the least."""
+    cur_round = game.current_round
+    best = None
+    for i in _numeric_indices(player.hand):
+        value = player.hand[i].numeric_value()
+        beats = value < cur_round.current_highest if cur_round.reversed else value > cur_round.current_highest
+        if beats and (best is None or abs(value - cur_round.current_highest)
+                      < abs(player.hand[best].numeric_value() - cur_round.current_highest)):
+            best = i
+    if best is None:
+        return engine.Fold()
+    return engine.Raise((best,))
+
+def random_policy(game, player, rng):
+    """Random card selection; rejected raises fall back to folding."""
+    if not player.hand or rng.random() < 0.25:
+        return engine.Fold()
+    k = rng.randint(1, min(len(player.hand), game.cfg.max_cards_per_play + 1))
+    return engine.Raise(tuple(rng.sample(range(len(player.hand)), k)))
+
+POLICIES = {"greedy": greedy_policy, "random": random_policy}
+
+def mulligan_choice(game, player):
+    # 가장 낮은 숫자 카드부터 버린다 (특수 카드는 마지막)
+    order = sorted(range(len(player.hand)),
+                   key=lambda i: (player.hand[i].is_special(), player.hand[i].numeric_value() or 0))
+    return engine.MulliganDiscard(tuple(order[:game.cfg.mulligan_count]))
+
+def j_choice(game, player):
+    if player.id not in game.j_target:
+        others = [p for p in game.players if p is not player]
+        return engine.JSelect(max(others, key=lambda p: len(p.hand)).name)
+    target = game.get_player(game.j_target[player.id])
+    if not target.hand:
+        return engine.JDiscard(())
+    best = max(range(len(target.hand)), key=lambda i: target.hand[i].numeric_value() or 0)
+    return engine.JDiscard((best,))
+
+def scripted_action(game, player, policy, rng):
+    """The action a scripted player takes: J / mulligan heuristics, else ``policy``."""
+    if game.j_pending.get(player.id):
+        return j_choice(game, player)
+    if game.mulligan_info.get(player.id, {}).get("pending"):
+        return mulligan_choice(game, player)
+    return policy(game, player, rng)
+
+def step(game, player, policy, rng):
+    """Play one scripted turn step for ``player`` and return the engine events."""
+    _, events = engine.apply(game, player, scripted_action(game, player, policy, rng))
+    if events[0]["type"] == "error":
+        _, events = engine.apply(game, player, engine.Fold())
+    return events
+
+# ── parity check against the legacy refresh rule ────
+
+def check_deck_parity(game):
+    """Draw + discard piles must equal the cards the old full-scan refresh would find."""
+    in_play = set()
+    for p in game.players:
+        in_play.update(c.id for c in p.hand)
+        in_play.update(c.id for c in p.score_cards)
+    if game.current_round is not None:
+        for entry in game.current_round.bet_history:
+            in_play.update(c.id for c in entry[1])
+    piles = list(game.deck.cards) + list(game.deck.discards)
+    expected = {c.id for c in CARDS} - in_play
+    assert len(piles) == len(set(piles)) and set(piles) == expected, "deck parity violated"
+
+# ── single game ─────────────────────────────────────
+
+def play_out(game, policy_for, rng, check=False, latencies=None):
+    """Play ``game`` to the end; returns ``(first_seat, round_turns)``.
+
+    ``policy_for(player)`` gives each player's policy. If ``latencies`` is a
+    list, the wall time of every step is appended to it.
+    """
+    turns = 0
+    round_turns = []
+    max_turns = 200 * game.cfg.player_count
+    first_seat = None
+    while not game.game_over:
+        cur_round = game.start_round()
+        if first_seat is None:
+            first_seat = cur_round.first_player_index
+        start = turns
+        while game.current_round is not None and turns - start < max_turns:
+            player = cur_round.players[cur_round.current_turn_index]
+            if latencies is None:
+                step(game, player, policy_for(player), rng)
+            else:
+                started = time.perf_counter()
+                step(game, player, policy_for(player), rng)
+                latencies.append(time.perf_counter() - started)
+            turns += 1
+            if check:
+                check_deck_parity(game)
+        if game.current_round is not None:
+            # 진행 불가 상태 (모두 낼 카드가 없음) → 강제 종료
+            game.current_round.active_players.clear()
+            game.end_round()
+        round_turns.append(turns - start)
+    return first_seat, round_turns
+
+def play_game(cfg, policies, rng, check=False):
+    """Play one full game and return its statistics."""
+    game = Game(cfg, room_id="sim", seed=rng.getrandbits(64))
+    for i in range(cfg.player_count):
+        game.add_player(Player(f"p{i}", pid=str(i)))
+    first_seat, round_turns = play_out(game, lambda player: policies[int(player.id)], rng, check)
+    return {
+        "scores": [p.total_points for p in game.players],
+        "first_seat": first_seat,
+        "rounds": len(game.round_history),
+        "round_turns": round_turns,
+        "refreshes": game.deck.refresh_count,
+    }
+
+def _run_batch(args):
+    cfg, policy_names, n_games, seed, check = args
+    rng = random.Random(seed)
+    policies = [POLICIES[name] for name in policy_names]
+    return [play_game(cfg, policies, rng, check) for _ in range(n_games)]
+
+# ── aggregation ─────────────────────────────────────
+
+def percentile(sorted_values, q):
+    """Nearest-rank ``q`` quantile of an already sorted list (None if empty)."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def summarize(cfg, results):
+    scores = sorted(s for r in results for s in r["scores"])
+    first_scores = [r["scores"][r["first_seat"]] for r in results]
+    other_scores = [s for r in results for i, s in enumerate(r["scores"]) if i != r["first_seat"]]
+    first_wins = sum(r["scores"][r["first_seat"]] == max(r["scores"]) for r in results)
+    round_turns = [t for r in results for t in r["round_turns"]]
+    rounds = sum(r["rounds"] for r in results)
+    return {
+        "config": {k: v for k, v in vars(cfg).items() if k not in ("title", "private")},
+        "games": len(results),
+        "score": {
+            "mean": statistics.fmean(scores),
+            "stdev": statistics.pstdev(scores),
+            "p10": percentile(scores, 0.1),
+            "p50": percentile(scores, 0.5),
+            "p90": percentile(scores, 0.9),
+        },
+        "first_player": {
+            "mean_score_delta": statistics.fmean(first_scores) - statistics.fmean(other_scores),
+            "win_rate": first_wins / len(results),
+            "fair_win_rate": 1 / cfg.player_count,
+        },
+        "round_length": {
+            "mean_turns": statistics.fmean(round_turns),
+            "max_turns": max(round_turns),
+        },
+        "deck_refresh": {
+            "per_game": sum(r["refreshes"] for r in results) / len(results),
+            "per_round": sum(r["refreshes"] for r in results) / max(rounds, 1),
+        },
+    }
+
+def run_grid(grid, games, policy_names, workers=None, batch=250, seed=0, check=False):
+    """Simulate every config in ``grid`` and return a list of summaries."""
+    jobs = []
+    for gi, cfg in enumerate(grid):
+        names = [policy_names[i % len(policy_names)] for i in range(cfg.player_count)]
+        for b in range(0, games, batch):
+            jobs.append((gi, (cfg, names, min(batch, games - b), seed + gi * 1_000_003 + b, check)))
+    results = [[] for _ in grid]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for (gi, _), batch_results in zip(jobs, pool.map(_run_batch, [job for _, job in jobs])):
+            results[gi].extend(batch_results)
+    return [summarize(cfg, res) for cfg, res in zip(grid, results)]
+
+def _ints(text):
+    return [int(x) for x in text.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = GameConfig()
+    parser.add_argument("--games", type=int, default=1000, help="games per grid point")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policies", default="greedy,random",
+                        help="comma-separated policies assigned to seats round-robin")
+    parser.add_argument("--check", action="store_true", help="assert deck parity after every turn")
+    for field in ("player_count", "hand_count", "mulligan_count",
+                  "max_cards_per_play", "first_player_threshold"):
+        parser.add_argument("--" + field.replace("_", "-"), type=_ints,
+                            default=[getattr(defaults, field)])
+    args = parser.parse_args(argv)
+    fields = ("player_count", "hand_count", "mulligan_count", "max_cards_per_play", "first_player_threshold")
+    grid = [GameConfig(**dict(zip(fields, values)))
+            for values in itertools.product(*(getattr(args, f) for f in fields))]
+    summaries = run_grid(grid, args.games, args.policies.split(","), args.workers, seed=args.seed, check=args.check)
+    print(json.dumps(summaries, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
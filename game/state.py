@@ -0,0 +1,93 @@
+from operator import attrgetter
+
+import engine
+
+# 카드 직렬화 방식: "ids" – 카드 id 정수 (클라이언트가 /cards.json 테이블로 렌더링),
+#                  "html" – 서버에서 만든 <span> 문자열
+CARD_WIRE = {"ids": attrgetter("id"), "html": attrgetter("html")}
+
+# 합법 배팅 목록이 이보다 길면 playable 마스크만 보낸다 (조합 확인은 서버가 한다)
+LEGAL_RAISES_WIRE_MAX = 128
+
+# ── 상태 payload 생성 ───────────────────────────────
+# 공개 정보(public)는 상태 변경마다 한 번만 만들고,
+# 플레이어별 비공개 정보(private)만 각자 합쳐서 전송한다.
+
+def public_state(game, wire="ids"):
+    """모든 플레이어에게 동일하게 전송되는 공개 상태"""
+    card = CARD_WIRE[wire]
+    if not game.current_round:
+        return {
+            "message": "라운드가 종료되었습니다.",
+            "players": [p.name for p in game.players],
+        }
+    cur_round = game.current_round
+    history = cur_round.bet_history[::-1]
+    recent_bets = [
+        {
+            "player": name,
+            "value": value,
+            "cards": [card(c) for c in cards]
+        }
+        for name, cards, value, _ in history
+    ]
+    graph_data = [
+        {"value": value, "reversed": (effect == "reversed")}
+        for name, cards, value, effect in history
+    ]
+    # 턴 순서 생성
+    n = len(cur_round.players)
+    start = cur_round.first_player_index
+    turn_order = [cur_round.players[(start + i) % n].name for i in range(n)]
+
+    players = {
+        p.name: {
+            "남은 패": len(p.hand),
+            "누적 승점": p.total_points,
+            "행동": p.last_action,
+            "score_cards": [card(c) for c in p.score_cards]
+        }
+        for p in game.players
+    }
+    total_rounds = game.cfg.first_player_threshold * len(game.players)
+    return {
+        "first_player": cur_round.players[start].name,
+        "current_turn": cur_round.players[cur_round.current_turn_index].name,
+        "turn_order": turn_order,
+        "recent_bets": recent_bets,
+        "graph_data": graph_data,
+        "total_rounds": total_rounds,
+        "completed_rounds": len(game.round_history),
+        "remaining_rounds": game.stats.remaining_rounds(game),
+        "players": players,
+        "game_over": game.game_over,
+        "info_message": game.info_message,
+    }
+
+def private_state(game, player, wire="ids"):
+    """해당 플레이어에게만 보이는 정보: 손패, 멀리건 카드, J 대상"""
+    card = CARD_WIRE[wire]
+    if not game.current_round:
+        return {}
+    pid = player.id if player else None
+    pending_j = game.j_pending.get(pid, False)
+    mulligan = game.mulligan_info.get(pid, {})
+    target = game.get_player(game.j_target.get(pid)) if pending_j else None
+    # 자기 차례일 때만 낼 수 있는 조합 / 카드 표시
+    cur_round = game.current_round
+    legal = None
+    if (player and player is cur_round.players[cur_round.current_turn_index]
+            and not pending_j and not mulligan.get("pending")):
+        legal = engine.legal_raises_for(game, player)
+    return {
+        "pending_j": pending_j,
+        "hand": [card(c) for c in player.hand] if player else [],
+        "mulligan_cards": [card(c) for c in mulligan["cards"]] if mulligan.get("pending") else None,
+        "j_candidates": [p.name for p in game.players if p is not player]
+                        if pending_j and not target else None,
+        "j_target": target.name if target else None,
+        "j_target_hand": [card(c) for c in target.hand] if target else None,
+        "legal_raises": [list(move) for move in legal]
+                        if legal is not None and len(legal) <= LEGAL_RAISES_WIRE_MAX else None,
+        "playable": engine.playable_mask(player.hand, legal) if legal is not None else None,
+    }
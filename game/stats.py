@@ -0,0 +1,127 @@
+"""Running per-player and per-room statistics.
+
+``Game.stats`` is updated in O(1) per event as the game runs: raises and
+folds from ``Round``, mulligans from ``engine``, the winning bet in
+``Round.finish_round`` and round / start counts in ``Game.start_round`` /
+``Game.end_round``. Reading the figures (``summary``) only divides the
+running counters, it never rescans ``round_history``.
+"""
+
+SPECIAL_EFFECTS = ("J", "Q", "K", "joker")
+
+def _new_player(name):
+    return {
+        "name": name,
+        "rounds": 0,          # 시작할 때 자리에 있었던 라운드 수
+        "wins": 0,
+        "win_value": 0,       # 이긴 배팅 값 합계 (평균 = win_value / wins)
+        "points": 0,
+        "ace_bonus": 0,
+        "k_bonus": 0,
+        "raises": 0,
+        "folds": 0,           # 멀리건 후 폴드 포함
+        "mulligans": 0,
+        "specials": dict.fromkeys(SPECIAL_EFFECTS, 0),
+    }
+
+class GameStats:
+    __slots__ = ("players", "room")
+
+    def __init__(self):
+        self.players: dict[str, dict] = {}    # player_id -> counters (떠난 플레이어도 유지)
+        self.room = {
+            "rounds": 0,
+            "no_winner": 0,       # 모두 폴드해서 승자 없이 끝난 라운드
+            "starts": 0,          # 현재 자리에 있는 플레이어들의 starting_count 합
+            "highest_total": 0,   # 라운드 최고 배팅 값 합계
+            "raises": 0,
+            "folds": 0,
+            "mulligans": 0,
+            "specials": dict.fromkeys(SPECIAL_EFFECTS, 0),
+        }
+
+    def __getstate__(self):
+        return (self.players, self.room)
+
+    def __setstate__(self, state):
+        self.players, self.room = state
+
+    # ── hooks (models / engine) ─────────────────────
+
+    def add_player(self, player):
+        self.players.setdefault(player.id, _new_player(player.name))
+
+    def remove_player(self, player):
+        # 남은 라운드 수는 자리에 있는 플레이어 기준이라 떠난 사람의 선 횟수는 뺀다
+        self.room["starts"] -= player.starting_count
+
+    def round_started(self, players):
+        self.room["starts"] += 1
+        for p in players:
+            self.players[p.id]["rounds"] += 1
+
+    def raised(self, player, effect):
+        row = self.players[player.id]
+        row["raises"] += 1
+        self.room["raises"] += 1
+        if effect:
+            row["specials"][effect] += 1
+            self.room["specials"][effect] += 1
+
+    def folded(self, player):
+        self.players[player.id]["folds"] += 1
+        self.room["folds"] += 1
+
+    def mulliganed(self, player):
+        self.players[player.id]["mulligans"] += 1
+        self.room["mulligans"] += 1
+
+    def round_won(self, player, value, points, ace_bonus, k_bonus):
+        row = self.players[player.id]
+        row["wins"] += 1
+        row["win_value"] += value
+        row["points"] += points
+        row["ace_bonus"] += ace_bonus
+        row["k_bonus"] += k_bonus
+
+    def round_ended(self, cur_round):
+        self.room["rounds"] += 1
+        self.room["highest_total"] += cur_round.current_highest
+        if cur_round.winner is None:
+            self.room["no_winner"] += 1
+
+    # ── read side ───────────────────────────────────
+
+    def remaining_rounds(self, game):
+        return game.cfg.first_player_threshold * len(game.players) - self.room["starts"]
+
+    def summary(self, game):
+        """Counters plus derived averages and rates, as a JSON-ready dict."""
+        def ratio(a, b):
+            return round(a / b, 3) if b else None
+
+        players = {}
+        for pid, row in self.players.items():
+            players[row["name"]] = dict(
+                row,
+                specials=dict(row["specials"]),
+                seated=pid in game.players_by_id,
+                avg_win_value=ratio(row["win_value"], row["wins"]),
+                win_rate=ratio(row["wins"], row["rounds"]),
+                fold_rate=ratio(row["folds"], row["rounds"]),
+                mulligan_rate=ratio(row["mulligans"], row["rounds"]),
+            )
+        room = self.room
+        return {
+            "room_id": game.room_id,
+            "version": game.version,
+            "total_rounds": game.cfg.first_player_threshold * len(game.players),
+            "remaining_rounds": self.remaining_rounds(game),
+            "room": dict(
+                room,
+                specials=dict(room["specials"]),
+                avg_highest=ratio(room["highest_total"], room["rounds"]),
+                no_winner_rate=ratio(room["no_winner"], room["rounds"]),
+            ),
+            "players": players,
+        }
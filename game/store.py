@@ -0,0 +1,216 @@
+"""Room storage: in-memory and SQLite-backed containers for rooms.
+
+``routes.games`` and ``routes.waiting_rooms`` are ``MemoryStore`` (a plain
+dict with a ``mark_dirty`` hook) by default. ``SQLiteStore`` keeps the same
+live objects in memory but also persists a compact binary snapshot of each
+room. Dirty rooms are written in batches, and every room is restored when
+the store opens.
+
+The RNG state (about 2.5 KB of Mersenne Twister words) is not stored: the
+snapshot keeps ``seed`` and the action log, and ``decode_game`` replays the
+log (``replay.py``) to bring ``Game.rng`` back to the same point.
+"""
+import dataclasses
+import pickle
+import sqlite3
+import threading
+import zlib
+from array import array
+
+from actionlog import ActionLog
+from models import CARDS, Game, GameConfig, Player, Round
+from replay import replay
+
+SNAPSHOT_FORMAT = 5
+
+# ── compact snapshots ───────────────────────────────
+# 카드 목록은 카드 id 바이트열로, 나머지는 기본 타입 tuple 로 인코딩한다.
+
+def _cards(cards):
+    return bytes(card.id for card in cards)
+
+def _uncards(data):
+    return [CARDS[i] for i in data]
+
+def _encode_player(p):
+    return (p.id, p.name, p.is_bot, _cards(p.hand), _cards(p.score_cards), p.total_points,
+            _cards(p.current_bet_cards), p.in_round, p.starting_count, p.has_raised,
+            p.mulligan_used, p.last_action)
+
+def _decode_player(t):
+    (pid, name, is_bot, hand, score, total, bet, in_round, starting,
+     has_raised, mulligan_used, last_action) = t
+    p = Player(name, pid=pid, is_bot=is_bot)
+    p.hand, p.score_cards, p.current_bet_cards = _uncards(hand), _uncards(score), _uncards(bet)
+    p.total_points, p.in_round, p.starting_count = total, in_round, starting
+    p.has_raised, p.mulligan_used, p.last_action = has_raised, mulligan_used, last_action
+    return p
+
+def _encode_round(r):
+    entry_index = {id(entry): i for i, entry in enumerate(r.bet_history)}
+    return (
+        [p.id for p in r.players], r.first_player_index, r.current_turn_index, r.current_highest,
+        [(name, _cards(cards), value, effect) for name, cards, value, effect in r.bet_history],
+        list(r.active_players), r.round_over, r.winner.id if r.winner else None, r.reversed,
+        _cards(r.scored_cards), {pid: entry_index[id(e)] for pid, e in r.last_bet.items()},
+    )
+
+def _decode_round(t, game):
+    (order, first, turn, highest, history, active, round_over, winner,
+     reversed_, scored, last_bet) = t
+    by_id = game.players_by_id
+    r = Round([by_id[pid] for pid in order], game.deck, first, game.cfg, game.stats)
+    r.current_turn_index, r.current_highest = turn, highest
+    r.bet_history = [(name, _uncards(cards), value, effect) for name, cards, value, effect in history]
+    r.active_players = {pid: by_id[pid] for pid in active}
+    r.round_over, r.winner, r.reversed = round_over, by_id.get(winner), reversed_
+    r.scored_cards = _uncards(scored)
+    r.last_bet = {pid: r.bet_history[i] for pid, i in last_bet.items()}
+    return r
+
+def encode_game(game):
+    """Serialize a Game (players, round, deck) into a compact binary snapshot."""
+    state = (
+        SNAPSHOT_FORMAT, dataclasses.asdict(game.cfg), game.room_id,
+        [_encode_player(p) for p in game.players],
+        game.first_player_index, game.round_history, game.game_over, game.aborted,
+        [pid for pid, pending in game.j_pending.items() if pending], game.j_target,
+        {pid: (info.get('pending', False), _cards(info.get('cards', ())))
+         for pid, info in game.mulligan_info.items()},
+        game.info_message, game.version,
+        (bytes(game.deck.cards), bytes(game.deck.discards), game.deck.refresh_count),
+        _encode_round(game.current_round) if game.current_round else None,
+        game.seed, bytes(game.log), game.seats,
+        game.stats.__getstate__(),
+    )
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+def decode_game(data):
+    """Rebuild a Game from ``encode_game`` output."""
+    (fmt, cfg, room_id, players, first, round_history, game_over, aborted, j_pending,
+     j_target, mulligan, info_message, version, deck, cur_round,
+     seed, log, seats, stats) = pickle.loads(zlib.decompress(data))
+    if fmt != SNAPSHOT_FORMAT:
+        raise ValueError(f"unsupported snapshot format {fmt}")
+    game = Game(GameConfig(**cfg), room_id, seed=seed)
+    for t in players:
+        game.add_player(_decode_player(t))
+    game.first_player_index, game.round_history = first, round_history
+    game.game_over, game.aborted = game_over, aborted
+    game.j_pending = {pid: True for pid in j_pending}
+    game.j_target = dict(j_target)
+    game.mulligan_info = {pid: {'pending': pending, 'cards': _uncards(cards)}
+                          for pid, (pending, cards) in mulligan.items()}
+    game.info_message, game.version = info_message, version
+    game.deck.cards, game.deck.discards = array('B', deck[0]), array('B', deck[1])
+    game.deck.refresh_count = deck[2]
+    game.current_round = _decode_round(cur_round, game) if cur_round else None
+    # RNG 는 seed 에서 로그를 다시 돌려 같은 지점으로 맞춘다 (덱이 같은 Random 객체를 공유)
+    game.rng.setstate(replay(game.cfg, seed, log, room_id).rng.getstate())
+    # add_player 가 남긴 JOIN 기록 대신 원래 로그로 교체
+    game.log, game.seats = ActionLog(log), seats
+    game.stats.__setstate__(stats)
+    return game
+
+def encode_waiting_room(info):
+    state = (SNAPSHOT_FORMAT, dataclasses.asdict(info['config']), info['joiners'],
+             sorted(info.get('bots', ())), info.get('last_left'), info.get('seats'))
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+def decode_waiting_room(data):
+    fmt, cfg, joiners, bot_names, last_left, seats = pickle.loads(zlib.decompress(data))
+    if fmt != SNAPSHOT_FORMAT:
+        raise ValueError(f"unsupported snapshot format {fmt}")
+    info = {'config': GameConfig(**cfg), 'joiners': joiners, 'bots': set(bot_names)}
+    if last_left:
+        info['last_left'] = last_left
+    if seats is not None:
+        info['seats'] = seats      # 토너먼트 테이블: 배정된 참가자만 입장
+    return info
+
+# ── stores ──────────────────────────────────────────
+
+class MemoryStore(dict):
+    """room_id -> room object. Routes call ``mark_dirty`` after mutating a room."""
+
+    def mark_dirty(self, room_id):
+        pass
+
+    def flush(self):
+        pass
+
+class SQLiteStore(MemoryStore):
+    """MemoryStore that also persists room snapshots to SQLite.
+
+    Writes are batched: dirty rooms are encoded and written together once
+    ``batch_size`` rooms are dirty or when ``flush`` is called (routes flush
+    periodically). Rooms are loaded back when the store is opened.
+    """
+
+    def __init__(self, conn, table, encode, decode, batch_size=32):
+        super().__init__()
+        self.conn = conn
+        self.table = table
+        self.encode = encode
+        self.batch_size = batch_size
+        self._dirty = set()
+        self._deleted = set()
+        self._lock = threading.Lock()
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (room_id TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        for room_id, data in conn.execute(f"SELECT room_id, data FROM {table}"):
+            dict.__setitem__(self, room_id, decode(data))
+
+    @classmethod
+    def open_pair(cls, path, batch_size=32):
+        """Open (waiting_rooms, games) stores sharing one SQLite database."""
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return (cls(conn, "waiting_rooms", encode_waiting_room, decode_waiting_room, batch_size),
+                cls(conn, "games", encode_game, decode_game, batch_size))
+
+    def __setitem__(self, room_id, value):
+        super().__setitem__(room_id, value)
+        self.mark_dirty(room_id)
+
+    def __delitem__(self, room_id):
+        super().__delitem__(room_id)
+        self._forget(room_id)
+
+    def pop(self, room_id, *default):
+        had = room_id in self
+        value = super().pop(room_id, *default)
+        if had:
+            self._forget(room_id)
+        return value
+
+    def _forget(self, room_id):
+        with self._lock:
+            self._dirty.discard(room_id)
+            self._deleted.add(room_id)
+
+    def mark_dirty(self, room_id):
+        if room_id not in self:
+            return
+        with self._lock:
+            self._dirty.add(room_id)
+            self._deleted.discard(room_id)
+            full = len(self._dirty) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            deleted, self._deleted = self._deleted, set()
+        rows = [(rid, self.encode(self[rid])) for rid in dirty if rid in self]
+        if not rows and not deleted:
+            return
+        with self.conn:
+            self.conn.execute("BEGIN")
+            if rows:
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (room_id, data) VALUES (?, ?)", rows)
+            if deleted:
+                self.conn.executemany(
+                    f"DELETE FROM {self.table} WHERE room_id = ?", [(rid,) for rid in deleted])
@@ -0,0 +1,89 @@
+"""Idle / finished room eviction.
+
+``RoomSweeper`` remembers the last activity time of every room and, on each
+``sweep``, picks the rooms whose TTL has run out:
+
+* ``finished`` – games that are over or aborted (``ROOM_FINISHED_TTL``)
+* ``idle``     – games and waiting rooms nobody touched (``ROOM_IDLE_TTL``)
+
+Routes run the actual eviction on the room's command queue, notify the
+sockets still in the room and report the counts and reclaimed memory.
+"""
+import gc
+import sys
+import time
+import types
+
+from models import Card
+
+# 카드는 공유 싱글턴이라 방을 지워도 회수되지 않는다
+_SHARED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, Card)
+
+def deep_sizeof(obj):
+    """Approximate bytes owned by ``obj`` (shared cards, classes and modules excluded)."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _SHARED):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        stack.extend(gc.get_referents(o))
+    return total
+
+class RoomSweeper:
+    def __init__(self, waiting_rooms, games, idle_ttl=1800.0, finished_ttl=300.0, clock=time.monotonic):
+        self.waiting_rooms = waiting_rooms
+        self.games = games
+        self.idle_ttl = idle_ttl
+        self.finished_ttl = finished_ttl
+        self.clock = clock
+        self.last_active: dict[str, float] = {}
+        self.evicted = {"finished": 0, "idle": 0}
+        self.bytes_reclaimed = 0
+        self.sweeps = 0
+
+    def touch(self, room_id):
+        self.last_active[room_id] = self.clock()
+
+    def expired(self, room_id, now=None):
+        """Eviction reason for ``room_id`` ("finished" / "idle") or None."""
+        now = self.clock() if now is None else now
+        # 저장소에서 복원된 방은 처음 본 시점부터 계산
+        idle = now - self.last_active.setdefault(room_id, now)
+        game = self.games.get(room_id)
+        if game is not None and (game.game_over or game.aborted) and idle >= self.finished_ttl:
+            return "finished"
+        if (game is not None or room_id in self.waiting_rooms) and idle >= self.idle_ttl:
+            return "idle"
+        return None
+
+    def candidates(self):
+        """Rooms whose TTL has run out, as ``(room_id, reason)`` pairs."""
+        now = self.clock()
+        self.sweeps += 1
+        for room_id in list(self.last_active):
+            if room_id not in self.games and room_id not in self.waiting_rooms:
+                del self.last_active[room_id]   # 이미 다른 경로로 삭제된 방
+        rooms = set(self.games) | set(self.waiting_rooms)
+        return [(rid, reason) for rid in sorted(rooms) if (reason := self.expired(rid, now))]
+
+    def evict(self, room_id, reason):
+        """Drop the room from both containers; returns the approximate bytes freed."""
+        size = deep_sizeof([self.games.get(room_id), self.waiting_rooms.get(room_id)])
+        self.games.pop(room_id, None)
+        self.waiting_rooms.pop(room_id, None)
+        self.last_active.pop(room_id, None)
+        self.evicted[reason] += 1
+        self.bytes_reclaimed += size
+        return size
+
+    def stats(self):
+        return {
+            "rooms": len(self.games) + len(self.waiting_rooms),
+            "sweeps": self.sweeps,
+            "evicted": dict(self.evicted),
+            "bytes_reclaimed": self.bytes_reclaimed,
+        }
@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+
+import pytest
+
+# 모듈들이 game/ 에 평평하게 있고 ``from models import ...`` 로 서로를 불러온다
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Game, GameConfig, Player  # noqa: E402
+from simulate import greedy_policy, random_policy, step  # noqa: E402
+
+def new_game(player_count=3, seed=1, **cfg):
+    game = Game(GameConfig(player_count=player_count, **cfg), "test", seed=seed)
+    for i in range(player_count):
+        game.add_player(Player(f"p{i}"))
+    return game
+
+def play(game, steps, rng, on_step=None):
+    """Advance ``game`` by up to ``steps`` scripted steps (rounds are started as needed)."""
+    for _ in range(steps):
+        if game.game_over:
+            break
+        if game.current_round is None:
+            game.start_round()
+            continue
+        cur_round = game.current_round
+        player = cur_round.players[cur_round.current_turn_index]
+        step(game, player, greedy_policy if rng.random() < 0.8 else random_policy, rng)
+        if on_step:
+            on_step(game)
+    return game
+
+@pytest.fixture
+def played_game():
+    """A 4-player game some way into play, with a round in progress."""
+    game = new_game(4, seed=7)
+    play(game, 40, random.Random(7))
+    if game.current_round is None and not game.game_over:
+        game.start_round()
+    return game
@@ -0,0 +1,65 @@
+import copy
+import random
+
+from conftest import new_game, play
+from routes import merge_patches, state_patch
+from state import private_state, public_state
+
+def apply_patch(target, patch):
+    """Same rules as ``applyPatch`` in main.html."""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            apply_patch(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+    return target
+
+def strip_none(value):
+    """None values and missing keys mean the same thing on the wire."""
+    if isinstance(value, dict):
+        return {k: strip_none(v) for k, v in value.items() if v is not None}
+    return value
+
+def player_views(seed=3, steps=120):
+    """Successive personal views of p0 over a scripted game.
+
+    Like the routes, the next round is started before the state is built.
+    """
+    game = new_game(3, seed=seed)
+    player = game.players[0]
+    views = []
+
+    def record(g):
+        if g.current_round is None and not g.game_over:
+            g.start_round()
+        views.append(dict(public_state(g), **private_state(g, player)))
+    play(game, steps, random.Random(seed), on_step=record)
+    return views
+
+def test_patch_turns_old_into_new():
+    views = player_views()
+    for old, new in zip(views, views[1:]):
+        assert strip_none(apply_patch(copy.deepcopy(old), state_patch(old, new))) == strip_none(new)
+
+def test_patch_of_equal_states_is_empty():
+    view = player_views(steps=10)[-1]
+    assert state_patch(view, copy.deepcopy(view)) == {}
+
+def test_merged_patches_equal_applying_each_in_turn():
+    views = player_views(seed=5)
+    patches = [state_patch(old, new) for old, new in zip(views, views[1:])]
+    for start in range(0, len(patches) - 8, 3):
+        merged = {}
+        for patch in patches[start:start + 8]:
+            merged = merge_patches(merged, patch)
+            assert merged is not None
+        result = apply_patch(copy.deepcopy(views[start]), merged)
+        assert strip_none(result) == strip_none(views[start + 8])
+
+def test_merge_refuses_dict_into_replaced_value():
+    assert merge_patches({"a": 1}, {"a": {"b": 2}}) is None
+    assert merge_patches({"a": None}, {"a": {"b": 2}}) is None
+    assert merge_patches({"a": {"b": 1}}, {"a": {"c": None}}) == {"a": {"b": 1, "c": None}}
+    assert merge_patches({"a": {"b": 1}}, {"a": 3}) == {"a": 3}
@@ -0,0 +1,93 @@
+from array import array
+
+import pytest
+
+import engine
+from conftest import new_game
+
+@pytest.fixture
+def game():
+    game = new_game(3, seed=11)
+    game.start_round()
+    return game
+
+def turn_player(game):
+    cur_round = game.current_round
+    return cur_round.players[cur_round.current_turn_index]
+
+def snapshot(game, player):
+    cur_round = game.current_round
+    return (list(player.hand), len(cur_round.bet_history), cur_round.current_turn_index,
+            cur_round.current_highest, bytes(game.log))
+
+def rejected(game, player, action):
+    before = snapshot(game, player)
+    _, events = engine.apply(game, player, action)
+    assert [e["type"] for e in events] == ["error"]
+    assert snapshot(game, player) == before
+    return events[0]["message"]
+
+def test_no_round(game):
+    game.current_round = None
+    _, events = engine.apply(game, game.players[0], engine.Fold())
+    assert events[0]["type"] == "error"
+
+def test_not_your_turn(game):
+    player = turn_player(game)
+    other = next(p for p in game.players if p is not player)
+    assert "차례" in rejected(game, other, engine.Fold())
+
+@pytest.mark.parametrize("indices", [(), (-2,), (0, 0), (99,), (300,)])
+def test_bad_raise_indices(game, indices):
+    rejected(game, turn_player(game), engine.Raise(indices))
+
+def test_legal_raise_is_applied_and_logged(game):
+    player = turn_player(game)
+    move = engine.legal_raises_for(game, player)[0]
+    played = [player.hand[i] for i in move]
+    log_size = len(bytes(game.log))
+    _, events = engine.apply(game, player, engine.Raise(move))
+    assert events[0]["type"] == "raise"
+    assert not set(played) & set(player.hand)
+    assert len(bytes(game.log)) > log_size
+
+def test_raise_must_beat_current_bet(game):
+    player = turn_player(game)
+    game.current_round.current_highest = 1000
+    numeric = next(i for i, card in enumerate(player.hand) if not card.is_special())
+    rejected(game, player, engine.Raise((numeric,)))
+
+def test_mulligan_discard_needs_exact_count(game):
+    player = turn_player(game)
+    _, events = engine.apply(game, player, engine.Fold())
+    assert events[0]["type"] == "mulligan"
+    count = game.cfg.mulligan_count
+    rejected(game, player, engine.MulliganDiscard(tuple(range(count - 1))))
+    rejected(game, player, engine.MulliganDiscard((-1,) + tuple(range(count - 1))))
+    _, events = engine.apply(game, player, engine.MulliganDiscard(tuple(range(count))))
+    assert events[0] == {"type": "fold", "player": player.name, "mulligan": True}
+
+def test_fold_during_mulligan_returns_drawn_cards(game):
+    player = turn_player(game)
+    hand = list(player.hand)
+    engine.apply(game, player, engine.Fold())
+    _, events = engine.apply(game, player, engine.Fold())
+    assert events[0] == {"type": "fold", "player": player.name, "mulligan": True}
+    assert player.hand == hand and player.id not in game.mulligan_info
+
+def test_fold_without_cards_to_draw_is_plain_fold(game):
+    player = turn_player(game)
+    game.deck.cards, game.deck.discards = array('B'), array('B')
+    _, events = engine.apply(game, player, engine.Fold())
+    assert events[0] == {"type": "fold", "player": player.name, "mulligan": False}
+
+def test_j_actions_need_pending_j(game):
+    player = turn_player(game)
+    other = next(p for p in game.players if p is not player)
+    rejected(game, player, engine.JSelect(other.name))
+    rejected(game, player, engine.JSelect("nobody"))
+    rejected(game, player, engine.JDiscard((0,)))
+
+def test_parse_action_errors():
+    assert engine.parse_action("raise", lambda key: ["x"])[0] is None
+    assert engine.parse_action("dance", lambda key: [])[0] is None
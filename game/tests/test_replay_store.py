@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from conftest import new_game, play
+from models import GameConfig
+from replay import export_game, load_export, replay
+from state import private_state, public_state
+from store import decode_game, decode_waiting_room, encode_game, encode_waiting_room
+
+def views(game):
+    return public_state(game), {p.name: private_state(game, p) for p in game.players}
+
+@pytest.mark.parametrize("player_count", [2, 4, 6])
+def test_replay_reproduces_recorded_game(player_count):
+    game = play(new_game(player_count, seed=player_count), 300, random.Random(player_count))
+    cfg, room_id, seed, log = load_export(export_game(game))
+    rebuilt = replay(cfg, seed, log, room_id)
+    assert views(rebuilt) == views(game)
+    assert list(rebuilt.deck.cards) == list(game.deck.cards)
+    assert rebuilt.rng.getstate() == game.rng.getstate()
+
+def test_replay_upto_stops_early():
+    game = new_game(3, seed=2)
+    checkpoints = []
+    play(game, 60, random.Random(2), on_step=lambda g: checkpoints.append(
+        (sum(1 for _ in g.log), public_state(g))))
+    cfg, room_id, seed, log = load_export(export_game(game))
+    for upto, public in checkpoints[::10]:
+        assert public_state(replay(cfg, seed, log, upto=upto)) == public
+
+def test_snapshot_round_trip(played_game):
+    restored = decode_game(encode_game(played_game))
+    assert views(restored) == views(played_game)
+    assert restored.version == played_game.version
+    assert bytes(restored.log) == bytes(played_game.log)
+    assert restored.rng.getstate() == played_game.rng.getstate()
+    assert restored.deck.rng is restored.rng
+    assert list(restored.deck.cards) == list(played_game.deck.cards)
+    assert list(restored.deck.discards) == list(played_game.deck.discards)
+    assert restored.stats.summary(restored) == played_game.stats.summary(played_game)
+
+def test_restored_game_plays_on_identically(played_game):
+    restored = decode_game(encode_game(played_game))
+    play(played_game, 100, random.Random(9))
+    play(restored, 100, random.Random(9))
+    assert views(restored) == views(played_game)
+
+def test_waiting_room_round_trip():
+    info = {'config': GameConfig(player_count=3), 'joiners': ['봇1', 'a'], 'bots': {'봇1'},
+            'seats': ['a', 'b'], 'last_left': 'c'}
+    assert decode_waiting_room(encode_waiting_room(info)) == info
@@ -0,0 +1,196 @@
+"""Bracketed tournaments: many tables with one shared GameConfig.
+
+Entrants are seated across tables of ``cfg.player_count`` seats; short
+tables are filled with bots. When every table of a round reaches
+``game_over``, the top ``advance`` entrants of each table by
+``total_points`` (ties: more round wins, then seat order) go on to the
+next round. This repeats until a single final table decides the champion.
+
+``Tournament`` only keeps the bracket. Tables are played either live as
+rooms (``routes``: ``POST /tournament``) or headless across a process
+pool for load testing::
+
+    python tournament.py --entrants 256 --player-count 4 [--workers N]
+"""
+import argparse
+import json
+import os
+import random
+import secrets
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bots import bot_name
+from models import Game, GameConfig, Player
+from simulate import POLICIES, percentile, play_out
+
+def seat_tables(names, table_size, rng):
+    """Shuffle ``names`` and deal them onto as few tables as possible, sizes balanced."""
+    names = list(names)
+    rng.shuffle(names)
+    count = -(-len(names) // table_size)
+    return [names[i::count] for i in range(count)]
+
+class Tournament:
+    def __init__(self, cfg, entrants, advance=1, seed=None, tournament_id=None):
+        entrants = list(entrants)
+        if len(entrants) < 2 or len(set(entrants)) != len(entrants):
+            raise ValueError("참가자는 2명 이상, 이름이 겹치지 않아야 합니다.")
+        if not 0 < advance < cfg.player_count:
+            raise ValueError("테이블당 진출 인원은 1 이상, 테이블 인원 미만이어야 합니다.")
+        self.id = tournament_id or secrets.token_hex(3)
+        self.cfg = cfg
+        self.advance = advance
+        self.rng = random.Random(seed)
+        self.rounds: list[list[dict]] = []    # 라운드별 테이블 목록
+        self.champion = None
+        self.finished = False
+        self._seat(entrants)
+
+    @property
+    def tables(self):
+        """Tables of the round being played."""
+        return self.rounds[-1]
+
+    def _seat(self, names):
+        r = len(self.rounds) + 1
+        self.rounds.append([
+            {
+                "id": f"r{r}t{i + 1}",
+                "seats": seats,
+                "bots": [],           # 빈 자리를 채운 봇 이름 (fill_bots)
+                "room_id": None,      # 라이브 진행 시 방 id
+                "standings": None,    # [(name, points, wins)], 끝난 뒤 순위순
+            }
+            for i, seats in enumerate(seat_tables(names, self.cfg.player_count, self.rng))
+        ])
+
+    def fill_bots(self, table):
+        """Bot names for the empty seats of ``table`` (recorded on the table)."""
+        taken = list(table["seats"])
+        while len(taken) < self.cfg.player_count:
+            taken.append(bot_name(taken))
+        table["bots"] = taken[len(table["seats"]):]
+        return table["bots"]
+
+    def table(self, table_id):
+        return next((t for t in self.tables if t["id"] == table_id), None)
+
+    def record(self, table_id, standings):
+        """Store a finished table's ``(name, points, wins)`` rows.
+
+        Rows for bots or for players not seated at the table are ignored; a
+        table closed without a game records ``[]``. Returns True when this
+        completed the round (the next round, or the champion, is then set).
+        """
+        table = self.table(table_id)
+        if table is None or table["standings"] is not None:
+            return False
+        seated = set(table["seats"])
+        rows = [row for row in standings if row[0] in seated]
+        order = {name: i for i, name in enumerate(table["seats"])}
+        table["standings"] = sorted(rows, key=lambda row: (-row[1], -row[2], order[row[0]]))
+        if any(t["standings"] is None for t in self.tables):
+            return False
+        if len(self.tables) == 1:
+            winners = [row[0] for row in table["standings"][:1]]
+        else:
+            winners = []
+            for t in self.tables:
+                # 사람이 advance 명 이하인 테이블에서도 최소 한 명은 떨어져야 토너먼트가 줄어든다
+                n = max(1, min(self.advance, len(t["standings"]) - 1))
+                winners.extend(row[0] for row in t["standings"][:n])
+        if len(winners) > 1:
+            self._seat(winners)
+        else:
+            self.champion = winners[0] if winners else None
+            self.finished = True
+        return True
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "advance": self.advance,
+            "player_count": self.cfg.player_count,
+            "finished": self.finished,
+            "champion": self.champion,
+            "rounds": [[dict(t) for t in tables] for tables in self.rounds],
+        }
+
+def standings(game):
+    """``(name, points, wins)`` of everyone still seated in ``game``."""
+    return [(p.name, p.total_points, game.stats.players[p.id]["wins"]) for p in game.players]
+
+# ── headless tables ─────────────────────────────────
+
+def play_table(args):
+    """Play one table with scripted players; returns its standings and per-turn latencies."""
+    cfg, seats, bots, seed, policy = args
+    rng = random.Random(seed)
+    game = Game(cfg, room_id="tournament", seed=rng.getrandbits(64))
+    for name in seats:
+        game.add_player(Player(name))
+    for name in bots:
+        game.add_player(Player(name, is_bot=True))
+    latencies = []
+    play_out(game, lambda player: POLICIES[policy], rng, latencies=latencies)
+    return standings(game), latencies
+
+def run_headless(tournament, workers=None, policy="greedy", seed=0):
+    """Play every round of ``tournament`` across a process pool; returns throughput metrics."""
+    rng = random.Random(seed)
+    latencies = []
+    rounds = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        while not tournament.finished:
+            tables = tournament.tables
+            jobs = [(tournament.cfg, t["seats"], tournament.fill_bots(t), rng.getrandbits(64), policy)
+                    for t in tables]
+            round_started = time.perf_counter()
+            for table, (rows, table_latencies) in zip(tables, pool.map(play_table, jobs)):
+                latencies.extend(table_latencies)
+                tournament.record(table["id"], rows)
+            rounds.append({"tables": len(tables), "seconds": round(time.perf_counter() - round_started, 3)})
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    tables = sum(r["tables"] for r in rounds)
+    return {
+        "champion": tournament.champion,
+        "rounds": rounds,
+        "tables": tables,
+        "seconds": round(elapsed, 3),
+        "tables_per_second": round(tables / elapsed, 2),
+        "turns": len(latencies),
+        "turns_per_second": round(len(latencies) / elapsed, 1),
+        "turn_latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1e3, 4),
+            "p50": round(percentile(latencies, 0.5) * 1e3, 4),
+            "p99": round(percentile(latencies, 0.99) * 1e3, 4),
+            "max": round(latencies[-1] * 1e3, 4),
+        },
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = GameConfig()
+    parser.add_argument("--entrants", type=int, default=64)
+    parser.add_argument("--advance", type=int, default=1, help="entrants advancing per table")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", default="greedy", choices=sorted(POLICIES))
+    for field in ("player_count", "hand_count", "mulligan_count",
+                  "max_cards_per_play", "first_player_threshold"):
+        parser.add_argument("--" + field.replace("_", "-"), type=int, default=getattr(defaults, field))
+    args = parser.parse_args(argv)
+    cfg = GameConfig(player_count=args.player_count, hand_count=args.hand_count,
+                     mulligan_count=args.mulligan_count, max_cards_per_play=args.max_cards_per_play,
+                     first_player_threshold=args.first_player_threshold)
+    tournament = Tournament(cfg, [f"e{i}" for i in range(args.entrants)], args.advance, seed=args.seed)
+    report = run_headless(tournament, args.workers, args.policy, args.seed)
+    report["workers"] = args.workers or os.cpu_count()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()